@@ -1,8 +1,33 @@
 from flask import Blueprint, current_app, jsonify, request
 import requests
 
+from config import Config
+from services.prompt_builder import PromptBuilder
+
 bp = Blueprint("job_rec", __name__)
 
+# Only these sections feed the profile, lowest value first
+RECOMMEND_PROMPT = PromptBuilder(
+    "recommend",
+    token_budget=Config.RECOMMEND_PROMPT_MAX_TOKENS,
+    sections=["certifications", "education", "experience", "skills"]
+)
+
+def _render_recommend_prompt(data, preferred_domains):
+    skills = [s['name'] for s in data.get('skills', []) if s.get('name')]
+    experience = [e['position'] for e in data.get('experience', []) if e.get('position')]
+    education = [ed['degree'] for ed in data.get('education', []) if ed.get('degree')]
+    certifications = [c['name'] for c in data.get('certifications', []) if c.get('name')]
+    return (
+        "You are a career recommendation assistant. Suggest 5-7 suitable job titles based on the user profile."
+        f"\nSkills: {', '.join(skills) or 'None'}"
+        f"\nExperience: {'; '.join(experience) or 'None'}"
+        f"\nEducation: {'; '.join(education) or 'None'}"
+        f"\nCertifications: {', '.join(certifications) or 'None'}"
+        f"\nPreferred Domains: {', '.join(preferred_domains) or 'None'}"
+        "\nReturn a JSON array of job titles, from most to least relevant."
+    )
+
 @bp.route("/recommend", methods=["POST"])
 def llm_recommend_jobs():
     """
@@ -26,29 +51,12 @@ def llm_recommend_jobs():
         current_app.logger.error(f"Error fetching resumes for {user_id}: {e}")
         return jsonify({"error": "Failed to fetch user resumes"}), 502
 
-    # Build user profile
-    if not resumes:
-        profile = {'skills': [], 'experience': '', 'education': '', 'certifications': [], 'preferred_domains': []}
-    else:
-        r0 = resumes[0]
-        profile = {
-            'skills': [s.get('name') for s in r0.get('skills', []) if s.get('name')],
-            'experience': '; '.join(e.get('position') for e in r0.get('experience', []) if e.get('position')),
-            'education': '; '.join(ed.get('degree') for ed in r0.get('education', []) if ed.get('degree')),
-            'certifications': [c.get('name') for c in r0.get('certifications', []) if c.get('name')],
-            'preferred_domains': r0.get('preferred_domains', []) or []
-        }
-
-    # Construct prompt content
-    prompt_content = (
-        "You are a career recommendation assistant. Suggest 5-7 suitable job titles based on the user profile."
-        f"\nSkills: {', '.join(profile['skills']) or 'None'}"
-        f"\nExperience: {profile['experience'] or 'None'}"
-        f"\nEducation: {profile['education'] or 'None'}"
-        f"\nCertifications: {', '.join(profile['certifications']) or 'None'}"
-        f"\nPreferred Domains: {', '.join(profile['preferred_domains']) or 'None'}"
-        "\nReturn a JSON array of job titles, from most to least relevant."
-    )
+    # Build the user profile prompt from the first resume, trimmed to the token budget
+    r0 = resumes[0] if resumes else {}
+    preferred_domains = r0.get('preferred_domains', []) or []
+    prompt = RECOMMEND_PROMPT.build(lambda data: _render_recommend_prompt(data, preferred_domains), r0)
+    prompt_content = prompt.text
+    current_app.logger.debug(f"Recommendation prompt: ~{prompt.estimated_tokens} tokens")
 
     # NVIDIA LLM API settings
     invoke_url = current_app.config.get('NVIDIA_API_URL', 'https://integrate.api.nvidia.com/v1/chat/completions')
@@ -178,6 +186,17 @@ def save_jobs(all_jobs):
     with open(json_path, 'w') as f:
         json.dump(all_jobs, f, indent=2)
 
+def load_saved_jobs():
+    """
+    Load jobs from recommended_jobs.json, or an empty list if it doesn't exist
+    """
+    import json
+    json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'recommended_jobs.json')
+    if not os.path.exists(json_path):
+        return []
+    with open(json_path) as f:
+        return json.load(f)
+
 @bp.route('/run-scraper', methods=['POST'])
 def run_scraper():
     data = request.get_json() or {}
@@ -4,7 +4,6 @@ from api.limiter import limiter
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import jwt as pyjwt
-from services.resume_parser import ResumeParser
 from services.resume_optimizer import ResumeOptimizer
 from sqlalchemy.orm import Session
 from database.db import get_db
@@ -17,7 +16,7 @@ from flask import make_response
 from database.models import (
     User, Resume, PersonalInfo, Education, Experience, 
     Skill, Project, Achievement, Extracurricular, Course,
-    Certification, VolunteerWork, Publication
+    Certification, VolunteerWork, Publication, Job
 )
 from api.schemas import (
     UserCreate, UserResponse, ResumeCreate, ResumeResponse, 
@@ -25,12 +24,22 @@ from api.schemas import (
     SkillSchema, ProjectSchema, AchievementSchema, 
     ExtracurricularSchema, CourseSchema, CertificationSchema,
     VolunteerWorkSchema, PublicationSchema, ResumeOptimizeRequest,
-    UserLogin
+    ResumeOptimizeBatchRequest, UserLogin
 )
-from api.job_recommendation import llm_recommend_jobs
-from services.resume_parser import ResumeParser
+from api.job_recommendation import llm_recommend_jobs, load_saved_jobs
 from services.resume_optimizer import ResumeOptimizer
 from services.resume_generator import ResumeGenerator
+from services.resume_optimizer import GEMINI_BREAKER
+from services.resume_parser import PARSE_CACHE, PARSE_MODE_STATS
+from services.model_registry import registry as model_registry
+from services.job_index import JobIndex, job_posting_text
+from services.optimize_jobs import OptimizeJobQueue, QueueFullError
+from services.bulk_ingest import BulkIngestor, BulkUploadError, collect_pdfs
+from services.resume_persistence import persist_parsed_resumes
+from services.deadline import Deadline
+from services.ats_rules import ats_issues, ats_result
+from services.prompt_builder import prompt_stats
+from utils.timing import timed, start_request, current_request, end_request, aggregator as timing_aggregator
 import uuid
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
@@ -46,6 +55,29 @@ api = Blueprint('api', __name__)
 CORS(api, origins=["http://localhost:8080"])
 
 
+from flask import g
+
+@api.before_request
+def start_request_timing():
+    g.timing_token = start_request()
+
+@api.after_request
+def add_server_timing(response):
+    timings = current_request()
+    if timings is not None:
+        # Streamed responses only cover the work done before the first chunk
+        if Config.SERVER_TIMING_HEADER:
+            response.headers['Server-Timing'] = timings.header()
+        timing_aggregator.record(request.endpoint or request.path, timings)
+    return response
+
+@api.teardown_request
+def end_request_timing(exc):
+    token = g.pop("timing_token", None)
+    if token is not None:
+        end_request(token)
+
+
 from flask import send_file
 import io
 
@@ -75,7 +107,8 @@ def export_resume(resume_id):
         import datetime
 
         db = next(get_db())
-        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        with timed("db"):
+            resume = db.query(Resume).filter(Resume.id == resume_id).first()
         if not resume:
             response = make_response(jsonify({"error": "Resume not found"}), 404)
             response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
@@ -223,18 +256,22 @@ def export_resume(resume_id):
 
             return r
 
-        transformed_resume = transform_resume(resume)
+        # Lazy relationships load here, so this includes their queries
+        with timed("transform"):
+            transformed_resume = transform_resume(resume)
 
         # Render the HTML template with transformed resume data and visible sections
-        rendered_html = render_template(
-            f"modern.html" if template == "modern" else "default.html",
-            resume=transformed_resume,
-            visible_sections=visible_sections,
-            generated_date=generated_date
-        )
+        with timed("template"):
+            rendered_html = render_template(
+                f"modern.html" if template == "modern" else "default.html",
+                resume=transformed_resume,
+                visible_sections=visible_sections,
+                generated_date=generated_date
+            )
 
         # Generate PDF from rendered HTML using pdfkit
-        pdf_bytes = pdfkit.from_string(rendered_html, False)
+        with timed("pdf"):
+            pdf_bytes = pdfkit.from_string(rendered_html, False)
 
         # Return PDF as response with CORS headers
         from flask import Response
@@ -273,7 +310,8 @@ def export_resume_ats(resume_id):
             return response
 
         db = next(get_db())
-        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        with timed("db"):
+            resume = db.query(Resume).filter(Resume.id == resume_id).first()
         if not resume:
             response = make_response(jsonify({"error": "Resume not found"}), 404)
             response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
@@ -399,10 +437,13 @@ def export_resume_ats(resume_id):
 
             return r
 
-        transformed_resume = transform_resume(resume)
+        # Lazy relationships load here, so this includes their queries
+        with timed("transform"):
+            transformed_resume = transform_resume(resume)
 
         exporter = ResumeExporter(ats_mode=True)
-        pdf_bytes = exporter.export_resume_pdf(transformed_resume)
+        with timed("pdf"):
+            pdf_bytes = exporter.export_resume_pdf(transformed_resume)
 
         from flask import Response
         response = Response(pdf_bytes, mimetype='application/pdf')
@@ -417,8 +458,6 @@ def export_resume_ats(resume_id):
         return response
 
 
-optimizer = ResumeOptimizer()
-
 # @api.route('/api/apply-resume-changes', methods=['POST'])
 # def apply_resume_changes():
 #     try:
@@ -431,7 +470,7 @@ optimizer = ResumeOptimizer()
 #             return jsonify({"error": "Missing required fields"}), 400
 
 #         # Enhance the resume using Hugging Face-powered rewriting
-#         enhanced_resume = optimizer.enhance_resume(resume, ats_result, keyword_matches)
+#         enhanced_resume = resume_optimizer.enhance_resume(resume, ats_result, keyword_matches)
 
 #         return jsonify({
 #             "success": True,
@@ -457,32 +496,35 @@ def parse_resume_pdf():
         return jsonify({"error": "Empty filename"}), 400
 
     try:
-        parser = ResumeParser()
-        parsed_data = parser.parse_from_pdf(pdf_file)
-
-        # Create resume object here with parsed summary
+        # The new resume belongs to the caller, as with /resumes/parse-bulk
         db = next(get_db())
-
-        new_resume = Resume(
-            id=str(uuid.uuid4()),
-            title="Parsed Resume",
-            user_id=None,  # Assign if available
-            summary=parsed_data.get("summary", ""),
-            section_settings=[
-                {"name": "personal_info", "visible": True, "order": 1},
-                {"name": "summary", "visible": True, "order": 2},
-                {"name": "education", "visible": True, "order": 3},
-                {"name": "experience", "visible": True, "order": 4},
-                {"name": "skills", "visible": True, "order": 5},
-                {"name": "projects", "visible": True, "order": 6},
-            ]
-        )
-        db.add(new_resume)
-        db.commit()
-        db.refresh(new_resume)
+        current_user = get_current_user(db)
+        if not current_user:
+            return jsonify({"error": "Authentication required"}), 401
+
+        parser = model_registry.get("resume_parser")
+        bypass_cache = request.form.get("bypass_cache", "false").lower() in ("1", "true", "yes")
+        mode = request.form.get("mode") or None
+        if mode not in (None, "auto", "text", "pdf"):
+            return jsonify({"error": "mode must be auto, text or pdf"}), 400
+        with timed("parse"):
+            parsed_data, source, gemini_call = parser.parse(pdf_file, bypass_cache=bypass_cache, mode=mode)
+        if source is None:
+            return jsonify(parsed_data), 422
+
+        # The resume and every parsed section go in with one transaction
+        with timed("db"):
+            resume_id = persist_parsed_resumes([{
+                "data": parsed_data,
+                "user_id": current_user.id,
+                "title": request.form.get("title")
+            }])[0]
 
         return jsonify({
-            "resume_id": new_resume.id,
+            "resume_id": resume_id,
+            "from_cache": source == "cache",
+            "parsed_by": source,
+            "gemini_call": gemini_call,
             **parsed_data
         }), 200
 
@@ -494,6 +536,58 @@ def parse_resume_pdf():
     
 
 
+@api.route('/resumes/parse-bulk', methods=['POST', 'OPTIONS'])
+def parse_resumes_bulk():
+    from flask import Response, stream_with_context
+    if request.method == "OPTIONS":
+        response = make_response('', 204)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+        return response
+
+    # The created resumes belong to the caller, so this write needs a valid token
+    db = next(get_db())
+    current_user = get_current_user(db)
+    if not current_user:
+        response = make_response(jsonify({"error": "Authentication required"}), 401)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+    user_id = current_user.id
+
+    mode = request.form.get("mode") or None
+    if mode not in (None, "auto", "text", "pdf"):
+        response = make_response(jsonify({"error": "mode must be auto, text or pdf"}), 400)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+    try:
+        items = collect_pdfs(
+            request.files.getlist("resume_files"),
+            request.files.get("archive"),
+            max_files=Config.BULK_PARSE_MAX_FILES,
+            max_file_bytes=Config.BULK_PARSE_MAX_FILE_BYTES
+        )
+    except BulkUploadError as e:
+        response = make_response(jsonify({"error": str(e)}), 400)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+
+    def generate():
+        try:
+            for event in bulk_ingestor.ingest(items, user_id=user_id, mode=mode):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            current_app.logger.error(f"Error in bulk resume parsing: {str(e)}")
+            current_app.logger.error(traceback.format_exc())
+            yield json.dumps({"event": "error", "error": "Internal server error"}) + "\n"
+
+    response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+    return response
+
+
 @api.route("/login", methods=["POST"])
 @limiter.limit("5 per minute")
 def login():
@@ -534,9 +628,27 @@ def login():
 def test_endpoint():
     return jsonify({"message": "API is working"}), 200
 
-resume_parser = ResumeParser()
+# Models are loaded lazily through the shared registry, see /ready
 resume_optimizer = ResumeOptimizer()
 resume_generator = ResumeGenerator()
+optimize_queue = OptimizeJobQueue(
+    resume_optimizer.run_optimization,
+    max_workers=Config.OPTIMIZE_WORKERS,
+    max_queue=Config.OPTIMIZE_QUEUE_SIZE,
+    budget_ms=Config.OPTIMIZE_BUDGET_MS
+)
+# Local PDF extraction shares the optimizer's NLP pool when it is enabled
+bulk_ingestor = BulkIngestor(
+    lambda: model_registry.get("resume_parser"),
+    max_workers=Config.BULK_PARSE_WORKERS,
+    local_pool=resume_optimizer.nlp_pool,
+    batch_size=Config.BULK_PARSE_BATCH_SIZE
+)
+
+@api.route("/ready", methods=["GET"])
+def readiness():
+    ready = model_registry.is_ready()
+    return jsonify({"ready": ready, "models": model_registry.status()}), 200 if ready else 503
 
 @api.route("/resumes/<resume_id>/optimize", methods=["POST", "OPTIONS"])
 def optimize_resume(resume_id):
@@ -548,6 +660,104 @@ def optimize_resume(resume_id):
         return response
 
     try:
+        try:
+            optimize_request = ResumeOptimizeRequest(**(request.get_json(silent=True) or {}))
+        except Exception as e:
+            response = make_response(jsonify({"error": str(e)}), 400)
+            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+            return response
+        # The budget counts from here, so DB and serialization time come out of it too
+        deadline = Deadline(optimize_request.budget_ms or Config.OPTIMIZE_BUDGET_MS)
+
+        db = next(get_db())
+        with timed("db"):
+            resume_obj = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume_obj:
+            response = make_response(jsonify({"error": "Resume not found"}), 404)
+            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+            return response
+
+        # from_orm loads the lazy relationships, so this includes their queries
+        with timed("serialize"):
+            resume_data = ResumeResponse.from_orm(resume_obj).dict()
+        job_description = optimize_request.job_description
+        bypass_cache = optimize_request.bypass_cache
+
+        # ?async=1 queues the work and returns a job id to poll at /optimize-jobs/<job_id>
+        if request.args.get("async") in ("1", "true"):
+            try:
+                job_id = optimize_queue.submit(
+                    resume_id, resume_data, job_description,
+                    bypass_cache=bypass_cache, budget_ms=optimize_request.budget_ms
+                )
+            except QueueFullError as e:
+                response = make_response(jsonify({"error": "Too many optimize requests, try again later"}), 429)
+                response.headers['Retry-After'] = str(e.retry_after)
+                response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+                return response
+            response = make_response(jsonify({
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/api/optimize-jobs/{job_id}"
+            }), 202)
+            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+            return response
+
+        # Similarity, suggestions and skill gap, plus Gemini feedback (not direct editing).
+        # The boost paragraph and the advice are generated concurrently; whatever misses
+        # the budget is listed under "degraded".
+        response_data = resume_optimizer.run_optimization(
+            resume_data, job_description, bypass_cache=bypass_cache, deadline=deadline
+        )
+
+        with timed("json"):
+            response = make_response(jsonify(response_data), 200)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+
+    except Exception as e:
+        current_app.logger.error(f"Error optimizing resume {resume_id}: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        response = make_response(jsonify({"error": "Internal server error"}), 500)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+
+@api.route("/optimize-jobs/<job_id>", methods=["GET"])
+def get_optimize_job(job_id):
+    try:
+        job = optimize_queue.get(job_id)
+        if not job:
+            response = make_response(jsonify({"error": "Optimize job not found"}), 404)
+        else:
+            response = make_response(jsonify(job), 200)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+    except Exception as e:
+        current_app.logger.error(f"Error fetching optimize job {job_id}: {str(e)}")
+        response = make_response(jsonify({"error": "Internal server error"}), 500)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
+
+@api.route("/resumes/<resume_id>/optimize/stream", methods=["GET", "POST", "OPTIONS"])
+def optimize_resume_stream(resume_id):
+    from flask import Response, stream_with_context
+    if request.method == "OPTIONS":
+        response = make_response('', 204)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+        return response
+
+    try:
+        # EventSource can only GET, so the fields may also come as query parameters
+        try:
+            optimize_request = ResumeOptimizeRequest(**{**request.args.to_dict(), **(request.get_json(silent=True) or {})})
+        except Exception as e:
+            response = make_response(jsonify({"error": str(e)}), 400)
+            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+            return response
+        deadline = Deadline(optimize_request.budget_ms or Config.OPTIMIZE_BUDGET_MS)
+
         db = next(get_db())
         resume_obj = db.query(Resume).filter(Resume.id == resume_id).first()
         if not resume_obj:
@@ -556,39 +766,166 @@ def optimize_resume(resume_id):
             return response
 
         resume_data = ResumeResponse.from_orm(resume_obj).dict()
-        job_description = request.json.get("job_description", "")
+        job_description = optimize_request.job_description
+        bypass_cache = optimize_request.bypass_cache
+    except Exception as e:
+        current_app.logger.error(f"Error preparing optimize stream for resume {resume_id}: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        response = make_response(jsonify({"error": "Internal server error"}), 500)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        return response
 
-        # Optimization: similarity, suggestions, skill gap
-        optimization_result = resume_optimizer.optimize_for_job(resume_data, job_description)
+    def generate():
+        try:
+            for event, data in resume_optimizer.stream_optimization(resume_data, job_description, bypass_cache=bypass_cache, deadline=deadline):
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            current_app.logger.error(f"Error streaming optimization for resume {resume_id}: {str(e)}")
+            current_app.logger.error(traceback.format_exc())
+            yield f"event: error\ndata: {json.dumps({'stage': 'optimize', 'error': 'Internal server error'})}\n\n"
 
-        # Advanced improvement suggestions
-        ats_result = resume_optimizer.check_ats_compatibility(resume_data)
-        keyword_matches = {skill: 1.0 if skill not in optimization_result["missing_skills"] else 0.0
-                           for skill in optimization_result["missing_skills"]}
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let a reverse proxy buffer the events
+    response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+    return response
 
-        # Call Hugging Face Mistral for feedback (not direct editing)
-        improvement_advice = resume_optimizer.enhance_resume(
-            resume_data,
-            ats_result,
-            keyword_matches
-        )
+@api.route("/resumes/<resume_id>/optimize-batch", methods=["POST", "OPTIONS"])
+def optimize_resume_batch(resume_id):
+    if request.method == "OPTIONS":
+        response = make_response('', 204)
+        response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+        response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+        return response
 
-        response_data = {
-            "optimization": optimization_result,
-            "improvement_advice": improvement_advice
-        }
+    try:
+        try:
+            batch_request = ResumeOptimizeBatchRequest(**(request.get_json(silent=True) or {}))
+        except Exception as e:
+            response = make_response(jsonify({"error": str(e)}), 400)
+            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+            return response
 
-        response = make_response(jsonify(response_data), 200)
+        db = next(get_db())
+        resume_obj = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume_obj:
+            response = make_response(jsonify({"error": "Resume not found"}), 404)
+            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
+            return response
+
+        resume_data = ResumeResponse.from_orm(resume_obj).dict()
+
+        # Plain descriptions take precedence, then postings, then the scraped jobs on disk
+        if batch_request.job_descriptions:
+            jobs = [{"description": jd} for jd in batch_request.job_descriptions]
+            job_descriptions = batch_request.job_descriptions
+        else:
+            jobs = batch_request.jobs or load_saved_jobs()
+            job_descriptions = [job_posting_text(job) for job in jobs]
+
+        results = resume_optimizer.optimize_batch(resume_data, job_descriptions, top_k=batch_request.top_k)
+        for result in results:
+            result["job"] = jobs[result["index"]]
+
+        response = make_response(jsonify({"resume_id": resume_id, "results": results}), 200)
         response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
         return response
 
     except Exception as e:
-        current_app.logger.error(f"Error optimizing resume {resume_id}: {str(e)}")
+        current_app.logger.error(f"Error batch optimizing resume {resume_id}: {str(e)}")
         current_app.logger.error(traceback.format_exc())
         response = make_response(jsonify({"error": "Internal server error"}), 500)
         response.headers['Access-Control-Allow-Origin'] = 'http://localhost:8080'
         return response
 
+job_index = JobIndex(
+    Config.JOB_INDEX_DIR,
+    encode_fn=resume_optimizer.embed_texts,
+    ivf_min_size=Config.JOB_INDEX_IVF_MIN_SIZE,
+    nprobe=Config.JOB_INDEX_NPROBE
+)
+
+def sync_job_index(db):
+    # Index every job in the Job table plus the scraped postings; unchanged jobs are skipped
+    jobs = [
+        {
+            "id": job.id,
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "salary": job.salary,
+            "required_skills": job.required_skills or []
+        }
+        for job in db.query(Job).all()
+    ]
+    jobs.extend(load_saved_jobs())
+    return job_index.upsert(jobs)
+
+@api.route("/jobs/index", methods=["POST"])
+def rebuild_job_index():
+    try:
+        db = next(get_db())
+        updated = sync_job_index(db)
+        return jsonify({"updated": updated, "size": len(job_index)}), 200
+    except Exception as e:
+        current_app.logger.error(f"Error syncing job index: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({"error": "Internal server error"}), 500
+
+@api.route("/resumes/<resume_id>/job-matches", methods=["GET"])
+def resume_job_matches(resume_id):
+    import time
+    try:
+        k = request.args.get("k", 10, type=int)
+        mode = request.args.get("mode", "auto")
+        if mode not in ("auto", "flat", "ivf"):
+            return jsonify({"error": "mode must be one of auto, flat, ivf"}), 400
+
+        db = next(get_db())
+        resume_obj = db.query(Resume).filter(Resume.id == resume_id).first()
+        if not resume_obj:
+            return jsonify({"error": "Resume not found"}), 404
+
+        if len(job_index) == 0:
+            sync_job_index(db)
+
+        start = time.perf_counter()
+        resume_vector = resume_optimizer.embed_resume(ResumeResponse.from_orm(resume_obj).dict())
+        matches = job_index.search(resume_vector, k=k, mode=mode)
+        took_ms = (time.perf_counter() - start) * 1000
+
+        return jsonify({
+            "resume_id": resume_id,
+            "mode": mode,
+            "index_size": len(job_index),
+            "took_ms": round(took_ms, 2),
+            "results": [{"score": score, "job": job} for score, job in matches]
+        }), 200
+    except Exception as e:
+        current_app.logger.error(f"Error matching jobs for resume {resume_id}: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({"error": "Internal server error"}), 500
+
+@api.route("/optimizer/stats", methods=["GET"])
+def optimizer_stats():
+    # Counters are per worker process; the disk tier item count is shared
+    return jsonify({
+        "embedding_cache": resume_optimizer.embedding_cache.stats(),
+        "llm_cache": resume_optimizer.llm_cache.stats() if resume_optimizer.llm_cache else None,
+        "optimize_queue": optimize_queue.stats(),
+        "llm_breaker": GEMINI_BREAKER.stats(),
+        "parse_cache": PARSE_CACHE.stats() if PARSE_CACHE else None,
+        "parse_modes": PARSE_MODE_STATS.stats(),
+        "prompts": prompt_stats(),
+        "nlp_pool": resume_optimizer.nlp_pool.stats() if resume_optimizer.nlp_pool else None
+    }), 200
+
+@api.route("/metrics/timings", methods=["GET"])
+def timing_metrics():
+    # Stage durations of recent requests per endpoint, for this worker process
+    return jsonify(timing_aggregator.snapshot()), 200
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -599,6 +936,20 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = pyjwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def get_current_user(db):
+    """The User of the request's bearer token; None if it is missing, invalid or expired."""
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+    try:
+        payload = pyjwt.decode(auth_header[len("Bearer "):], SECRET_KEY, algorithms=[ALGORITHM])
+    except pyjwt.PyJWTError:
+        return None
+    email = payload.get("sub")
+    if not email:
+        return None
+    return db.query(User).filter(User.email == email).first()
+
 @api.route("/users", methods=["POST"])
 def create_user():
     if not request.is_json:
@@ -799,6 +1150,54 @@ def get_user_resumes(user_id):
         current_app.logger.error(f"Error fetching resumes for user {user_id}: {str(e)}")
         current_app.logger.error(traceback.format_exc())
         return jsonify({"error": "Internal server error"}), 500
+
+@api.route("/users/<user_id>/ats-report", methods=["GET"])
+def user_ats_report(user_id):
+    from sqlalchemy import exists
+    try:
+        db = next(get_db())
+
+        current_user = get_current_user(db)
+        if not current_user:
+            return jsonify({"error": "Authentication required"}), 401
+        if current_user.id != user_id:
+            return jsonify({"error": "Not allowed to view this user's resumes"}), 403
+
+        # One query for every resume of the user: only the columns the rules read,
+        # with the education check done in SQL instead of loading the rows
+        has_education = exists().where(Education.resume_id == Resume.id).label("has_education")
+        with timed("db"):
+            rows = db.query(
+                Resume.id, Resume.title, Resume.updated_at, Resume.section_settings,
+                PersonalInfo.email, PersonalInfo.phone, has_education
+            ).outerjoin(PersonalInfo, PersonalInfo.resume_id == Resume.id).filter(
+                Resume.user_id == user_id
+            ).order_by(Resume.updated_at.desc()).all()
+
+        with timed("ats_rules"):
+            report = []
+            for row in rows:
+                result = ats_result(ats_issues(row.email, row.phone, row.has_education, row.section_settings))
+                report.append({
+                    "resume_id": row.id,
+                    "title": row.title,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                    "is_compatible": result["is_compatible"],
+                    "compatibility_score": round(result["compatibility_score"], 2),
+                    "issues": result["issues"]
+                })
+
+        return jsonify({
+            "user_id": user_id,
+            "total": len(report),
+            "compatible": sum(1 for r in report if r["is_compatible"]),
+            "resumes": report
+        }), 200
+    except Exception as e:
+        current_app.logger.error(f"Error building ATS report for user {user_id}: {str(e)}")
+        current_app.logger.error(traceback.format_exc())
+        return jsonify({"error": "Internal server error"}), 500
+
 # Resume section routes
 
 from api.schemas import (
@@ -1122,4 +1521,11 @@ def recommended_jobs_json():
 
 @api.route("/run-scraper", methods=["POST"])
 def run_scraper_route():
-    return run_scraper()
+    response, status = run_scraper()
+    if status == 200:
+        # Keep the job index in step with the freshly scraped postings
+        try:
+            job_index.upsert(response.get_json().get("recommended_jobs", []))
+        except Exception as e:
+            current_app.logger.error(f"Error updating job index after scraping: {str(e)}")
+    return response, status
@@ -203,6 +203,16 @@ class ResumeResponse(BaseModel):
 # Services schemas
 class ResumeOptimizeRequest(BaseModel):
     job_description: str
+    bypass_cache: bool = False
+    budget_ms: Optional[int] = Field(None, gt=0)
+
+class ResumeOptimizeBatchRequest(BaseModel):
+    # Either plain job description strings or job postings (as scraped into
+    # recommended_jobs.json, optionally with a "description"). When both are
+    # empty the saved recommended jobs are used.
+    job_descriptions: List[str] = []
+    jobs: List[dict] = []
+    top_k: Optional[int] = None
 
 class ResumeOptimizeResponse(BaseModel):
     score: float
@@ -1,12 +1,15 @@
 from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
-from api.routes import api
-from database.db import Base, engine
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 def create_app():
+    # Imported here, not at module level: spawned pool processes re-import this
+    # module as __mp_main__ and must not build the routes' services and pools
+    from api.routes import api
+    from database.db import Base, engine
+
     app = Flask(__name__)
     app.config.from_object('config.Config')
     
@@ -24,6 +27,18 @@ def create_app():
     
     # Create database tables
     Base.metadata.create_all(bind=engine)
+
+    # Optimize jobs run in-process: ones whose worker is gone (no recent heartbeat) never finish
+    from api.routes import optimize_queue
+    optimize_queue.mark_interrupted()
+
+    # Optionally load models before the first request; /api/ready reports progress.
+    # With NLP_POOL_ENABLED this starts the pool processes instead of loading the
+    # embedder and spaCy into this process
+    if app.config.get("WARMUP_MODELS"):
+        import threading
+        from services.model_registry import registry
+        threading.Thread(target=registry.warmup, name="model-warmup", daemon=True).start()
     
     @app.route('/')
     def index():
@@ -0,0 +1,113 @@
+"""
+Compares the optimizer's embedding backends on a fixture set.
+
+For every backend (and thread setting) this reports load time, encode
+throughput and the cosine drift of its vectors and of resume/job similarity
+scores against the fp32 baseline, so a deployment can pick a backend.
+
+Usage (from the repository root):
+    python -m benchmarks.embedding_backends --backends fp32,int8 --threads 1,4 --output bench_embeddings.json
+"""
+import os
+import json
+import time
+import argparse
+import statistics
+
+import numpy as np
+import torch
+
+from services.embedding_backends import EMBEDDING_BACKENDS, EMBEDDING_MODEL_NAME, build_embedder
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "embedding_texts.json")
+
+
+def load_texts(path=FIXTURE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def measure_backend(backend, texts, num_threads=None, repeats=5, batch_size=32):
+    start = time.perf_counter()
+    model = build_embedder(backend=backend, model_name=EMBEDDING_MODEL_NAME, device="cpu", num_threads=num_threads)
+    load_seconds = time.perf_counter() - start
+
+    # One untimed pass so lazy initialisation doesn't count against throughput
+    vectors = model.encode(texts, convert_to_numpy=True, batch_size=batch_size)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.encode(texts, convert_to_numpy=True, batch_size=batch_size)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "backend": backend,
+        "num_threads": torch.get_num_threads(),
+        "load_seconds": round(load_seconds, 3),
+        "encode_seconds_median": round(median, 4),
+        "texts_per_second": round(len(texts) / median, 1)
+    }, normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def drift(baseline, candidate):
+    # Per-text cosine between the two backends' vectors
+    per_text = np.sum(baseline * candidate, axis=1)
+
+    # How much pairwise similarity scores (what the optimizer reports) move
+    score_delta = np.abs(baseline @ baseline.T - candidate @ candidate.T)
+    upper = score_delta[np.triu_indices(len(baseline), k=1)]
+
+    return {
+        "cosine_to_fp32_mean": round(float(per_text.mean()), 5),
+        "cosine_to_fp32_min": round(float(per_text.min()), 5),
+        "similarity_abs_error_mean": round(float(upper.mean()), 5) if upper.size else 0.0,
+        "similarity_abs_error_max": round(float(upper.max()), 5) if upper.size else 0.0
+    }
+
+
+def run(backends, thread_settings, repeats, fixture_path):
+    texts = load_texts(fixture_path)
+    results = []
+    baseline = None
+    for num_threads in thread_settings:
+        for backend in backends:
+            report, vectors = measure_backend(backend, texts, num_threads=num_threads, repeats=repeats)
+            if backend == "fp32" and baseline is None:
+                baseline = vectors
+            if baseline is not None:
+                report.update(drift(baseline, vectors))
+            results.append(report)
+    return {"model": EMBEDDING_MODEL_NAME, "texts": len(texts), "repeats": repeats, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default=",".join(EMBEDDING_BACKENDS),
+                        help="Comma separated backends; fp32 is always measured first as the baseline")
+    parser.add_argument("--threads", default="", help="Comma separated torch thread counts, e.g. 1,2,4")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--fixtures", default=FIXTURE_PATH)
+    parser.add_argument("--output", help="Write the JSON report to this file as well")
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    backends = ["fp32"] + [b for b in backends if b != "fp32"]
+    thread_settings = [int(t) for t in args.threads.split(",") if t.strip()] or [None]
+
+    report = run(backends, thread_settings, args.repeats, args.fixtures)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Per-stage latency breakdown of the resume optimizer.
+
+Synthetic resumes in the ResumeResponse shape are optimized against job
+descriptions of several lengths. Gemini is replaced by a fake client with a
+configurable latency, so the numbers only cover local work plus the simulated
+round trip. For every stage the report gives p50/p95/p99 in milliseconds;
+keep the JSON output of two commits to compare them.
+
+Stages: resume_text (_get_resume_text), embedding (model encode of the resume
+sections and the JD), similarity (_score_similarity on a cold embedding cache)
+and similarity_cached (the same call again), spacy_extraction,
+standardize_skill (per call), find_missing_skills, prompt_building (boost and
+advice prompts) and optimize_for_job (end to end).
+
+Usage (from the repository root):
+    python -m benchmarks.optimizer_benchmark --resumes 20 --jd-lengths 50,300,1200 --gemini-latency-ms 800 --output bench_optimizer.json
+"""
+import json
+import time
+import random
+import tempfile
+import argparse
+import platform
+import subprocess
+from types import SimpleNamespace
+from datetime import datetime, date
+
+import numpy as np
+
+from api.schemas import ResumeResponse
+from services.embedding_cache import EmbeddingCache
+from services.skill_normalizer import SkillNormalizer
+from services.resume_optimizer import ResumeOptimizer, STANDARD_SKILLS
+
+SKILL_TERMS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "Django", "Flask", "FastAPI",
+    "PostgreSQL", "MongoDB", "Docker", "Kubernetes", "AWS", "GCP", "Azure", "Spark",
+    "Airflow", "Pandas", "NumPy", "TensorFlow", "scikit-learn", "GraphQL", "REST API",
+    "Linux", "Bash", "Git", "Terraform", "Redis", "Kafka", "Java", "Go", "C++"
+]
+
+FILLER_WORDS = (
+    "built designed scalable services team customers platform pipeline latency reliability "
+    "data product features users deployment monitoring testing performance migration "
+    "architecture analytics dashboards integration automation ownership mentoring roadmap "
+    "stakeholders requirements delivery infrastructure security release quality metrics"
+).split()
+
+
+class FakeGeminiClient:
+    """Stands in for genai.Client: sleeps for the configured latency and returns canned text."""
+
+    def __init__(self, latency_ms=800, jitter_ms=0, chunks=8, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.chunks = chunks
+        self._rng = random.Random(seed)
+        self.models = self
+        self.calls = 0
+
+    def _delay(self):
+        jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _text(self):
+        return (
+            "Summary Advice: Results-driven engineer with a record of shipping scalable services.\n\n"
+            "Skills Advice: Group skills by category and lead with the ones the job asks for.\n\n"
+            "Projects Advice: Quantify the impact of each project."
+        )
+
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        time.sleep(self._delay())
+        return SimpleNamespace(text=self._text())
+
+    def generate_content_stream(self, model, contents, config=None):
+        self.calls += 1
+        text = self._text()
+        step = max(1, len(text) // self.chunks)
+        pause = self._delay() / self.chunks
+        for i in range(0, len(text), step):
+            time.sleep(pause)
+            yield SimpleNamespace(text=text[i:i + step])
+
+
+def _sentence(rng, words=12, skill_rate=0.25):
+    tokens = [rng.choice(SKILL_TERMS) if rng.random() < skill_rate else rng.choice(FILLER_WORDS) for _ in range(words)]
+    return " ".join(tokens).capitalize() + "."
+
+
+def _paragraph(rng, words):
+    sentences = []
+    while words > 0:
+        n = min(words, rng.randint(8, 18))
+        sentences.append(_sentence(rng, n))
+        words -= n
+    return " ".join(sentences)
+
+
+def synthetic_resume(rng, index):
+    """Builds a resume dict the way the routes do: through ResumeResponse."""
+    now = datetime.utcnow()
+    resume = {
+        "id": f"bench-{index}",
+        "user_id": "bench",
+        "title": f"Benchmark resume {index}",
+        "summary": _paragraph(rng, rng.randint(30, 80)),
+        "section_settings": [{"name": name, "visible": True, "order": i}
+                             for i, name in enumerate(["summary", "experience", "skills", "projects"])],
+        "personal_info": {"full_name": f"Candidate {index}", "email": f"candidate{index}@example.com"},
+        "education": [{"institution": "State University", "degree": "BSc", "field_of_study": "Computer Science",
+                       "start_date": date(2014, 9, 1), "end_date": date(2018, 6, 1)}],
+        "experience": [
+            {
+                "company": f"Company {i}",
+                "position": rng.choice(["Software Engineer", "Data Engineer", "Backend Developer"]),
+                "start_date": date(2018 + i, 1, 1),
+                "description": _paragraph(rng, rng.randint(25, 60)),
+                "achievements": [_sentence(rng, rng.randint(10, 20)) for _ in range(rng.randint(1, 4))]
+            }
+            for i in range(rng.randint(1, 4))
+        ],
+        "skills": [{"name": name} for name in rng.sample(SKILL_TERMS, rng.randint(6, 16))],
+        "projects": [
+            {
+                "title": f"Project {i}",
+                "description": _paragraph(rng, rng.randint(20, 50)),
+                "technologies": rng.sample(SKILL_TERMS, rng.randint(2, 6))
+            }
+            for i in range(rng.randint(0, 3))
+        ],
+        "created_at": now,
+        "updated_at": now
+    }
+    resume = ResumeResponse(**resume).dict()
+    # No id, so section embeddings are not read from or written to the database
+    resume["id"] = None
+    return resume
+
+
+def synthetic_job_description(rng, words):
+    return "We are hiring. " + _paragraph(rng, words)
+
+
+def percentiles(samples_ms):
+    if not samples_ms:
+        return {"count": 0}
+    values = np.asarray(samples_ms, dtype=np.float64)
+    return {
+        "count": int(values.size),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "mean_ms": round(float(values.mean()), 3)
+    }
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    def time(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.samples.setdefault(stage, []).append((time.perf_counter() - start) * 1000)
+        return result
+
+    def report(self):
+        return {stage: percentiles(samples) for stage, samples in self.samples.items()}
+
+
+def benchmark_pair(optimizer, timer, resume, job_description):
+    # Fresh normalizer and skill cache so every pair pays for its own lookups
+    optimizer.skill_normalizer = SkillNormalizer(STANDARD_SKILLS, threshold=85)
+    optimizer._skill_cache.clear()
+
+    resume_text = timer.time("resume_text", optimizer._get_resume_text, resume)
+
+    section_texts = [" ".join(parts) for parts in optimizer._get_section_parts(resume).values()]
+    section_texts = [t for t in section_texts if t.strip()]
+    timer.time("embedding", optimizer.embedder.encode, section_texts + [job_description],
+               convert_to_numpy=True, batch_size=32)
+    timer.time("similarity", optimizer._score_similarity, resume, job_description)
+    timer.time("similarity_cached", optimizer._score_similarity, resume, job_description)
+
+    resume_raw, job_raw = timer.time("spacy_extraction", optimizer._extract_skill_sets, [resume_text, job_description])
+
+    resume_skills, job_skills = set(), set()
+    for raw, target in ((resume_raw, resume_skills), (job_raw, job_skills)):
+        for skill in raw:
+            target.add(timer.time("standardize_skill", optimizer.standardize_skill, skill))
+
+    skill_gap = timer.time("find_missing_skills", optimizer._find_missing_skills, resume_skills, job_skills)
+
+    def build_prompts():
+        optimizer._build_boost_prompt(skill_gap.missing, job_description)
+        ats_result = optimizer.check_ats_compatibility(resume)
+        keyword_matches = {skill: 0.0 for skill in skill_gap.missing}
+        optimizer._build_enhance_prompt(resume, ats_result, keyword_matches)
+
+    timer.time("prompt_building", build_prompts)
+
+    optimizer._skill_cache.clear()
+    timer.time("optimize_for_job", optimizer.optimize_for_job, resume, job_description)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def run(resume_count, jd_lengths, gemini_latency_ms, gemini_jitter_ms, warmup, seed):
+    rng = random.Random(seed)
+    client = FakeGeminiClient(latency_ms=gemini_latency_ms, jitter_ms=gemini_jitter_ms, seed=seed)
+    optimizer = ResumeOptimizer(client=client)
+    optimizer.llm_cache = None
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Private embedding cache so earlier runs (or the server) can't make embeddings look free
+        optimizer.embedding_cache = EmbeddingCache(optimizer.embedding_namespace, cache_dir=cache_dir)
+
+        resumes = [synthetic_resume(rng, i) for i in range(resume_count)]
+        job_descriptions = {words: [synthetic_job_description(rng, words) for _ in range(resume_count)]
+                            for words in jd_lengths}
+
+        # Loads the models and fills lazy state outside the measurements
+        for i in range(warmup):
+            benchmark_pair(optimizer, StageTimer(), synthetic_resume(rng, -1 - i), synthetic_job_description(rng, jd_lengths[0]))
+
+        by_length = {}
+        overall = StageTimer()
+        for words, jds in job_descriptions.items():
+            timer = StageTimer()
+            for resume, job_description in zip(resumes, jds):
+                benchmark_pair(optimizer, timer, resume, job_description)
+            for stage, samples in timer.samples.items():
+                overall.samples.setdefault(stage, []).extend(samples)
+            by_length[str(words)] = timer.report()
+
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "resumes": resume_count,
+            "jd_lengths": jd_lengths,
+            "gemini_latency_ms": gemini_latency_ms,
+            "gemini_jitter_ms": gemini_jitter_ms,
+            "warmup": warmup,
+            "seed": seed
+        },
+        "stages": overall.report(),
+        "by_jd_length": by_length,
+        "gemini_calls": client.calls
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20, help="Synthetic resumes per JD length")
+    parser.add_argument("--jd-lengths", default="50,300,1200", help="Comma separated JD lengths in words")
+    parser.add_argument("--gemini-latency-ms", type=float, default=800)
+    parser.add_argument("--gemini-jitter-ms", type=float, default=0)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file as well")
+    args = parser.parse_args()
+
+    jd_lengths = [int(n) for n in args.jd_lengths.split(",") if n.strip()]
+    report = run(args.resumes, jd_lengths, args.gemini_latency_ms, args.gemini_jitter_ms, args.warmup, args.seed)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
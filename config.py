@@ -12,5 +12,99 @@ class Config:
     HF_TOKEN= os.environ.get("HF_TOKEN")
     DEVICE = os.environ.get("DEVICE", "cpu")  # force CPU usage for low resource machines
 
+    # Embedding backend for the optimizer: "fp32" or "int8" (dynamically quantized, CPU only).
+    # TORCH_NUM_THREADS pins torch's thread pool per worker; unset leaves torch's default.
+    # Compare backends with: python -m benchmarks.embedding_backends
+    EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "fp32")
+    TORCH_NUM_THREADS = int(os.environ["TORCH_NUM_THREADS"]) if os.environ.get("TORCH_NUM_THREADS") else None
+
+    # Embedding cache: in-process LRU plus memory-mapped shards shared by all workers.
+    # Set EMBEDDING_CACHE_DIR to an empty string to keep the cache in memory only.
+    EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "embeddings"))
+    EMBEDDING_CACHE_MEMORY_ITEMS = int(os.environ.get("EMBEDDING_CACHE_MEMORY_ITEMS", 2048))
+    EMBEDDING_CACHE_SHARD_SIZE = int(os.environ.get("EMBEDDING_CACHE_SHARD_SIZE", 1024))
+    EMBEDDING_CACHE_MAX_SHARDS = int(os.environ.get("EMBEDDING_CACHE_MAX_SHARDS", 64))
+
+    # spaCy model used for skill extraction: a package name or a path to a model directory.
+    # The model is never downloaded at runtime unless SPACY_AUTO_DOWNLOAD is set.
+    SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+    SPACY_AUTO_DOWNLOAD = os.environ.get("SPACY_AUTO_DOWNLOAD", "false").lower() in ("1", "true", "yes")
+    SPACY_BATCH_SIZE = int(os.environ.get("SPACY_BATCH_SIZE", 64))
+    SPACY_N_PROCESS = int(os.environ.get("SPACY_N_PROCESS", 1))
+    SKILL_EXTRACTION_CACHE_SIZE = int(os.environ.get("SKILL_EXTRACTION_CACHE_SIZE", 1024))
+
+    # Optional process pool that hosts the embedder and spaCy model so NLP work runs outside
+    # the request threads. Every pool process loads both models; NLP_POOL_PROCESSES=0 uses
+    # one process per core. Calls are split into chunks of NLP_POOL_CHUNK_SIZE texts.
+    NLP_POOL_ENABLED = os.environ.get("NLP_POOL_ENABLED", "false").lower() in ("1", "true", "yes")
+    NLP_POOL_PROCESSES = int(os.environ.get("NLP_POOL_PROCESSES", 0))
+    NLP_POOL_CHUNK_SIZE = int(os.environ.get("NLP_POOL_CHUNK_SIZE", 32))
+    NLP_POOL_TORCH_THREADS = int(os.environ.get("NLP_POOL_TORCH_THREADS", 1))
+
+    # Load all registered models in a background thread at startup instead of on first use
+    WARMUP_MODELS = os.environ.get("WARMUP_MODELS", "false").lower() in ("1", "true", "yes")
+
+    # Semantic job index (flat matrix, IVF approximate search once it has JOB_INDEX_IVF_MIN_SIZE jobs)
+    JOB_INDEX_DIR = os.environ.get("JOB_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "job_index"))
+    JOB_INDEX_IVF_MIN_SIZE = int(os.environ.get("JOB_INDEX_IVF_MIN_SIZE", 2000))
+    JOB_INDEX_NPROBE = int(os.environ.get("JOB_INDEX_NPROBE", 4))
+
+    # Threads shared by all requests for concurrent Gemini calls
+    LLM_MAX_WORKERS = int(os.environ.get("LLM_MAX_WORKERS", 8))
+
+    # Per-call Gemini timeout, and the circuit breaker that stops calling Gemini after
+    # LLM_BREAKER_FAILURES consecutive failures for LLM_BREAKER_RESET_SECONDS
+    LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", 20))
+    LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", 5))
+    LLM_BREAKER_RESET_SECONDS = float(os.environ.get("LLM_BREAKER_RESET_SECONDS", 30))
+
+    # Default latency budget of an optimize request; Gemini fields that miss it come back degraded.
+    # Each Gemini call times out when the budget runs out, and is not started with less than
+    # LLM_MIN_BUDGET_MS left
+    OPTIMIZE_BUDGET_MS = int(os.environ.get("OPTIMIZE_BUDGET_MS", 8000))
+    LLM_MIN_BUDGET_MS = int(os.environ.get("LLM_MIN_BUDGET_MS", 500))
+
+    # Estimated-token budgets (about 4 characters per token) for prompts that embed resume content;
+    # the lowest-value resume sections are trimmed first to fit
+    ADVICE_PROMPT_MAX_TOKENS = int(os.environ.get("ADVICE_PROMPT_MAX_TOKENS", 1500))
+    RECOMMEND_PROMPT_MAX_TOKENS = int(os.environ.get("RECOMMEND_PROMPT_MAX_TOKENS", 400))
+
+    # Background optimize jobs (POST /resumes/<id>/optimize?async=1): concurrent runs per worker
+    # process and how many more may wait before requests get 429
+    OPTIMIZE_WORKERS = int(os.environ.get("OPTIMIZE_WORKERS", 4))
+    OPTIMIZE_QUEUE_SIZE = int(os.environ.get("OPTIMIZE_QUEUE_SIZE", 32))
+
+    # Send per-stage timings as a Server-Timing header; they are aggregated at /api/metrics/timings either way
+    SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "true").lower() in ("1", "true", "yes")
+
+    # Cache of cleaned Gemini responses, stored in the llm_response_cache table
+    LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+    LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 5000))
+
+    # Resumes are parsed locally first; Gemini is only called below this overall confidence (0..1)
+    LOCAL_PARSE_ENABLED = os.environ.get("LOCAL_PARSE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOCAL_PARSE_MIN_CONFIDENCE = float(os.environ.get("LOCAL_PARSE_MIN_CONFIDENCE", 0.75))
+
+    # What Gemini gets when it is needed: "text" (the PDF's text in reading order), "pdf" (the file
+    # itself) or "auto" (text whenever the PDF has at least PARSE_TEXT_MODE_MIN_CHARS characters of it)
+    PARSE_GEMINI_MODE = os.environ.get("PARSE_GEMINI_MODE", "auto")
+    PARSE_TEXT_MODE_MIN_CHARS = int(os.environ.get("PARSE_TEXT_MODE_MIN_CHARS", 500))
+
+    # Concurrent Gemini parse calls per process, shared by single and bulk parsing
+    PARSE_GEMINI_CONCURRENCY = int(os.environ.get("PARSE_GEMINI_CONCURRENCY", 4))
+
+    # Bulk ingestion: parsing threads, resumes per insert transaction, and upload limits.
+    # Local extraction runs on the NLP pool when NLP_POOL_ENABLED is set
+    BULK_PARSE_WORKERS = int(os.environ.get("BULK_PARSE_WORKERS", 8))
+    BULK_PARSE_BATCH_SIZE = int(os.environ.get("BULK_PARSE_BATCH_SIZE", 25))
+    BULK_PARSE_MAX_FILES = int(os.environ.get("BULK_PARSE_MAX_FILES", 500))
+    BULK_PARSE_MAX_FILE_BYTES = int(os.environ.get("BULK_PARSE_MAX_FILE_BYTES", 10 * 1024 * 1024))
+
+    # Parsed resumes keyed by the PDF's content hash, stored in the resume_parse_cache table
+    PARSE_CACHE_ENABLED = os.environ.get("PARSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    PARSE_CACHE_TTL_SECONDS = int(os.environ.get("PARSE_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+    PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", 2000))
+
     NVIDIA_API_URL = os.environ.get("NVIDIA_API_URL", "https://integrate.api.nvidia.com/v1/chat/completions")
     NVIDIA_API_KEY = os.environ.get("NVIDIA_API_KEY", "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")
\ No newline at end of file
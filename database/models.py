@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Boolean, Integer, Float, Text,
-    ForeignKey, DateTime, Date, JSON
+    ForeignKey, DateTime, Date, JSON, LargeBinary, UniqueConstraint
 )
 from sqlalchemy.orm import relationship
 from database.db import Base
@@ -43,6 +43,8 @@ class Resume(Base):
     certifications = relationship("Certification", back_populates="resume", cascade="all, delete-orphan")
     volunteer_work = relationship("VolunteerWork", back_populates="resume", cascade="all, delete-orphan")
     publications = relationship("Publication", back_populates="resume", cascade="all, delete-orphan")
+    section_embeddings = relationship("ResumeSectionEmbedding", back_populates="resume", cascade="all, delete-orphan")
+    optimize_jobs = relationship("OptimizeJob", back_populates="resume", cascade="all, delete-orphan")
 
 
 class PersonalInfo(Base):
@@ -215,3 +217,59 @@ class Job(Base):
     salary = Column(Float, nullable=True)
     # store required_skills as a JSON array of strings
     required_skills = Column(JSON, nullable=False, default=[])
+
+
+class LLMResponseCache(Base):
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of model, generation config and prompt hash
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)  # Post-processed (clean_markdown) text
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
+    hits = Column(Integer, default=0)
+
+
+class ResumeParseCache(Base):
+    __tablename__ = "resume_parse_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of the PDF bytes and the parse prompt version
+    prompt_version = Column(String, nullable=False)
+    result = Column(JSON, nullable=False)  # Parsed resume JSON as returned by the parser
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
+    hits = Column(Integer, default=0)
+
+
+class ResumeSectionEmbedding(Base):
+    __tablename__ = "resume_section_embeddings"
+    __table_args__ = (UniqueConstraint("resume_id", "section", "model"),)
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    resume_id = Column(String, ForeignKey("resumes.id"), index=True)
+    section = Column(String, nullable=False)  # summary, experience, skills or projects
+    model = Column(String, nullable=False)  # Embedding model / backend namespace
+    content_hash = Column(String(64), nullable=False)  # sha256 of the section text
+    vector = Column(LargeBinary, nullable=False)  # float32 bytes
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    resume = relationship("Resume", back_populates="section_embeddings")
+
+
+class OptimizeJob(Base):
+    __tablename__ = "optimize_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    resume_id = Column(String, ForeignKey("resumes.id"), index=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed, interrupted
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    owner = Column(String, index=True)  # host:pid:boot id of the process running the job
+    heartbeat_at = Column(DateTime)  # refreshed by the owner while the job is unfinished
+
+    resume = relationship("Resume", back_populates="optimize_jobs")
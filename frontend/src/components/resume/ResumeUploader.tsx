@@ -2,7 +2,7 @@
 import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '@/contexts/AuthContext';
-import { resumeService, resumeSectionService } from '@/services/api';
+import { resumeService } from '@/services/api';
 import { 
   Card, 
   CardContent, 
@@ -82,52 +82,9 @@ export function ResumeUploader() {
     try {
       setIsUploading(true);
       
-      // 1. Parse the resume
-      const parsedData = await resumeService.parseResume(file);
-      
-      // 2. Create a new resume
-      const resumeData = {
-  user_id: user.id,
-  title: file.name.replace('.pdf', '') || 'Imported Resume',
-  summary: parsedData.summary || '',
-  personal_info: parsedData.personal_info || {},
-  education: parsedData.education || [],
-  experience: parsedData.experience || [],
-  skills: parsedData.skills || [],
-  projects: parsedData.projects || [],
-  achievements: parsedData.achievements || [],
-  certifications: parsedData.certifications || [],
-  section_settings: [
-    { name: 'personal_info', visible: true, order: 1 },
-    { name: 'summary', visible: true, order: 2 },
-    { name: 'education', visible: true, order: 3 },
-    { name: 'experience', visible: true, order: 4 },
-    { name: 'skills', visible: true, order: 5 },
-  ],
-};
-      
-      const newResume = await resumeService.createResume(resumeData);
-      
-      // 3. Update each section with the parsed data
-      if (parsedData.personal_info) {
-        await resumeSectionService.updateSection(newResume.id, 'personal_info', parsedData.personal_info);
-      }
-      
-      if (parsedData.education && parsedData.education.length > 0) {
-        await resumeSectionService.updateSection(newResume.id, 'education', parsedData.education);
-      }
-      
-      if (parsedData.experience && parsedData.experience.length > 0) {
-        await resumeSectionService.updateSection(newResume.id, 'experience', parsedData.experience);
-      }
-      
-      if (parsedData.skills && parsedData.skills.length > 0) {
-        await resumeSectionService.updateSection(newResume.id, 'skills', parsedData.skills);
-      }
-
-      if(parsedData.summary && parsedData.summary.length > 0) {
-        await resumeSectionService.updateSection(newResume.id, 'summary', { summary: parsedData.summary });
-      }
+      // The server creates the resume with every parsed section in one go
+      const title = file.name.replace('.pdf', '') || 'Imported Resume';
+      const parsedData = await resumeService.parseResume(file, title);
       
       toast({
         title: 'Resume uploaded successfully',
@@ -136,7 +93,7 @@ export function ResumeUploader() {
       });
       
       setOpen(false);
-      navigate(`/builder/${newResume.id}`);
+      navigate(`/builder/${parsedData.resume_id}`);
     } catch (error) {
       console.error('Error uploading resume:', error);
       toast({
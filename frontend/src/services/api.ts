@@ -84,9 +84,13 @@ export const resumeService = {
     const response = await api.delete(`/resumes/${resumeId}`);
     return response.data;
   },
-  parseResume: async (file: File) => {
+  // Parses the PDF and creates the resume with all parsed sections; returns the new resume_id with the parsed data
+  parseResume: async (file: File, title?: string) => {
     const formData = new FormData();
     formData.append('resume_file', file);
+    if (title) {
+      formData.append('title', title);
+    }
     const response = await api.post('/resumes/parse', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
@@ -0,0 +1,39 @@
+"""
+Rule-based ATS checks. They only look at contact details, section visibility
+and whether there is any education, so they run without the NLP models and
+can be applied to many resumes at once.
+"""
+
+ATS_REQUIRED_SECTIONS = ["summary", "experience", "education", "skills"]
+
+
+def ats_issues(email, phone, has_education, section_settings):
+    issues = []
+    if not email or not phone:
+        issues.append("Include phone and email in contact details.")
+    if not has_education:
+        issues.append("Add education section.")
+    visible_sections = [s["name"] for s in section_settings or [] if s.get("visible", True)]
+    for section in ATS_REQUIRED_SECTIONS:
+        if section not in visible_sections:
+            issues.append(f"Ensure {section} section is visible.")
+    return issues
+
+
+def resume_ats_issues(resume):
+    """ats_issues for a resume dict in the ResumeResponse shape."""
+    personal_info = resume.get("personal_info") or {}
+    return ats_issues(
+        personal_info.get("email"),
+        personal_info.get("phone"),
+        bool(resume.get("education")),
+        resume.get("section_settings")
+    )
+
+
+def ats_result(issues):
+    return {
+        "is_compatible": len(issues) == 0,
+        "issues": issues,
+        "compatibility_score": 1.0 - (len(issues) * 0.1)
+    }
@@ -0,0 +1,158 @@
+import os
+import time
+import uuid
+import logging
+import zipfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from database.db import SessionLocal
+from services.resume_persistence import persist_parsed_resumes
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUploadError(Exception):
+    """The upload as a whole can't be ingested (bad archive, too many files)."""
+
+
+def collect_pdfs(files=(), archive=None, max_files=500, max_file_bytes=10 * 1024 * 1024):
+    """
+    Returns [(filename, pdf bytes or None, error or None)] from uploaded
+    files and/or a zip archive. Oversized and non-PDF entries are kept with
+    an error so they show up in the results.
+    """
+    items = []
+    for upload in files:
+        if not upload or not upload.filename:
+            continue
+        # Checked before reading, so an oversized upload isn't buffered just to be rejected
+        if len(items) >= max_files:
+            raise BulkUploadError(f"Too many files, the limit is {max_files}")
+        data = upload.read(max_file_bytes + 1)
+        items.append(_checked(upload.filename, data, max_file_bytes))
+
+    if archive is not None:
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                for info in zf.infolist():
+                    name = info.filename
+                    if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                        continue
+                    if not name.lower().endswith(".pdf"):
+                        items.append((name, None, "not a PDF"))
+                        continue
+                    if info.file_size > max_file_bytes:
+                        items.append((name, None, "file too large"))
+                        continue
+                    # Read at most the limit: the declared size of a zip entry can't be trusted
+                    with zf.open(info) as f:
+                        items.append(_checked(name, f.read(max_file_bytes + 1), max_file_bytes))
+                    if len(items) > max_files:
+                        break
+        except zipfile.BadZipFile as e:
+            raise BulkUploadError(f"Invalid zip archive: {e}")
+
+    if not items:
+        raise BulkUploadError("No PDF files found in the upload")
+    if len(items) > max_files:
+        raise BulkUploadError(f"Too many files, the limit is {max_files}")
+    return items
+
+
+def _checked(name, data, max_file_bytes):
+    if len(data) > max_file_bytes:
+        return name, None, "file too large"
+    if not data.startswith(b"%PDF"):
+        return name, None, "not a PDF"
+    return name, data, None
+
+
+class BulkIngestor:
+    """
+    Parses many resumes with bounded concurrency and persists them in batches.
+
+    Files are parsed on a shared thread pool of max_workers, so concurrent bulk
+    uploads share the same bound. Local extraction runs on local_pool (the NLP
+    process pool) when one is given, otherwise on those threads, and Gemini
+    calls are capped by the parser's own semaphore. Successful parses are
+    inserted batch_size at a time, one transaction per batch.
+    """
+
+    def __init__(self, parser_factory, max_workers=8, local_pool=None, batch_size=25,
+                 session_factory=SessionLocal):
+        self.parser_factory = parser_factory
+        self.local_pool = local_pool
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-parse")
+
+    def ingest(self, items, user_id=None, mode=None):
+        """
+        Yields one "parsed" event per file as it finishes, a "persisted" event
+        per committed batch and a final "done" event with the totals.
+        """
+        started = time.perf_counter()
+        parser = self.parser_factory()
+        futures = {}
+        results = []
+        for index, (filename, data, error) in enumerate(items):
+            if error:
+                results.append({"event": "parsed", "index": index, "filename": filename, "status": "error", "error": error})
+            else:
+                futures[self._threads.submit(self._parse_one, parser, data, mode)] = (index, filename)
+
+        counts = {"files": len(items), "parsed": 0, "failed": len(results), "persisted": 0}
+        batch = []
+        try:
+            yield from results
+            for future in as_completed(futures):
+                index, filename = futures[future]
+                event = {"event": "parsed", "index": index, "filename": filename}
+                try:
+                    data, source, gemini_call = future.result()
+                except Exception as e:
+                    logger.error(f"Bulk parse of {filename} failed: {e}")
+                    data, source, gemini_call = {"error": str(e)}, None, None
+                if source is None:
+                    counts["failed"] += 1
+                    event.update(status="error", error=data.get("details") or data.get("error"))
+                else:
+                    counts["parsed"] += 1
+                    record = {"resume_id": str(uuid.uuid4()), "data": data, "user_id": user_id, "title": _title(filename)}
+                    batch.append(record)
+                    # The ID is final now but the row only exists after its batch's "persisted" event
+                    event.update(status="ok", resume_id=record["resume_id"], parsed_by=source, from_cache=source == "cache",
+                                 gemini_call=gemini_call, resume=data)
+                yield event
+
+                if len(batch) >= self.batch_size:
+                    persisted, batch = self._persist(batch, counts), []
+                    yield persisted
+            if batch:
+                persisted, batch = self._persist(batch, counts), []
+                yield persisted
+            yield {"event": "done", **counts, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+        finally:
+            # Client went away: drop work that hasn't started, keep what was parsed
+            for future in futures:
+                future.cancel()
+            if batch:
+                self._persist(batch, counts)
+
+    def _parse_one(self, parser, data, mode):
+        return parser.parse(BytesIO(data), mode=mode, local_pool=self.local_pool)
+
+    def _persist(self, batch, counts):
+        try:
+            resume_ids = persist_parsed_resumes(batch, self.session_factory)
+        except Exception as e:
+            logger.error(f"Persisting a batch of {len(batch)} parsed resumes failed: {e}")
+            return {"event": "persist_failed", "resume_ids": [r["resume_id"] for r in batch], "error": str(e)}
+        counts["persisted"] += len(resume_ids)
+        return {"event": "persisted", "resume_ids": resume_ids}
+
+
+def _title(filename):
+    name = os.path.splitext(os.path.basename(filename))[0].replace("_", " ").strip()
+    return f"Parsed Resume - {name}" if name else "Parsed Resume"
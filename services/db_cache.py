@@ -0,0 +1,123 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from database.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseTTLCache:
+    """
+    Database-backed key/value cache with expiry and LRU trimming.
+
+    Subclasses set entry_model (an ORM class with key, created_at, expires_at,
+    last_accessed_at and hits columns), value_column (the column holding the
+    cached value) and name (for log messages), and build their own keys.
+    Entries expire after ttl_seconds and the table is trimmed to max_entries
+    by evicting the least recently used rows. Database errors are logged and
+    treated as misses so a cache outage never breaks the caller.
+    """
+
+    entry_model = None
+    value_column = None
+    name = "Cache"
+
+    def __init__(self, ttl_seconds, max_entries, session_factory=SessionLocal):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+
+    def get(self, key):
+        db = self.session_factory()
+        try:
+            entry = db.get(self.entry_model, key)
+            now = datetime.utcnow()
+            if entry is not None and entry.expires_at > now:
+                entry.hits = (entry.hits or 0) + 1
+                entry.last_accessed_at = now
+                value = getattr(entry, self.value_column)
+                db.commit()
+                self._count("hits")
+                return value
+            if entry is not None:
+                db.delete(entry)
+                db.commit()
+            self._count("misses")
+            return None
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"{self.name} lookup failed: {e}")
+            self._count("errors")
+            self._count("misses")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key, value, **columns):
+        # columns: the entry model's other required columns
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            db.merge(self.entry_model(
+                key=key,
+                created_at=now,
+                expires_at=now + self.ttl,
+                last_accessed_at=now,
+                hits=0,
+                **{self.value_column: value},
+                **columns
+            ))
+            db.commit()
+            self._evict(db, now)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"{self.name} write failed: {e}")
+            self._count("errors")
+        finally:
+            db.close()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        entries = None
+        db = self.session_factory()
+        try:
+            entries = db.query(func.count(self.entry_model.key)).scalar()
+        except Exception:
+            db.rollback()
+        finally:
+            db.close()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            "entries": entries,
+            "max_entries": self.max_entries
+        }
+
+    def _evict(self, db, now):
+        model = self.entry_model
+        removed = db.query(model).filter(model.expires_at <= now).delete(synchronize_session=False)
+
+        overflow = db.query(func.count(model.key)).scalar() - self.max_entries
+        if overflow > 0:
+            oldest = db.query(model.key).order_by(model.last_accessed_at.asc()).limit(overflow).subquery()
+            removed += db.query(model).filter(model.key.in_(oldest.select())).delete(synchronize_session=False)
+
+        if removed:
+            db.commit()
+            self._count("evictions", removed)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
@@ -0,0 +1,35 @@
+import time
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    """
+    Latency budget for one request. Created when the request starts and passed
+    down through the optimizer stages, which ask how much time is left instead
+    of each using its own fixed timeout. A budget of None never expires.
+    """
+
+    def __init__(self, budget_ms=None):
+        self.budget_ms = budget_ms
+        self.expires_at = time.monotonic() + budget_ms / 1000 if budget_ms else None
+
+    def remaining(self):
+        """Seconds left, or None without a budget."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cap(self, seconds):
+        """The smaller of `seconds` and the time left; either may be None."""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        if seconds is None:
+            return remaining
+        return min(seconds, remaining)
@@ -0,0 +1,39 @@
+import torch
+from sentence_transformers import SentenceTransformer
+
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# fp32: the stock PyTorch model. int8: Linear layers dynamically quantized to
+# int8 weights, which is usually 2-3x faster on CPU with a small cosine drift.
+EMBEDDING_BACKENDS = ("fp32", "int8")
+
+
+def build_embedder(backend="fp32", model_name=EMBEDDING_MODEL_NAME, device="cpu", num_threads=None):
+    """
+    Builds the sentence embedder for the given backend. Every backend returns an
+    object with the SentenceTransformer encode() API so callers don't change.
+
+    num_threads pins torch's intra-op thread pool, which matters when several
+    gunicorn workers share the same cores.
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}")
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    model = SentenceTransformer(model_name, device=device)
+
+    if backend == "int8":
+        if device != "cpu":
+            raise ValueError("The int8 backend uses dynamic quantization and only runs on CPU")
+        model.eval()
+        torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    return model
+
+
+def cache_namespace(model_name, backend):
+    # Quantized vectors drift from fp32 ones, so each backend gets its own cache entries
+    return model_name if backend == "fp32" else f"{model_name}@{backend}"
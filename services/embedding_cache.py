@@ -0,0 +1,270 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache for sentence embeddings.
+
+    Entries are keyed by a SHA-256 of the model name and the normalized text.
+    Lookups go through an in-process LRU first and then a persistent tier made
+    of fixed-size memory-mapped .npy shards plus a SQLite index from key to
+    (shard, row). The persistent tier lives on disk so every gunicorn worker on
+    the machine shares it. A batch of misses only inserts its own index rows,
+    and a lookup is one keyed query, so neither grows with the cache size.
+    """
+
+    INDEX_FILE = "index.sqlite3"
+    # Keys per IN (...) query, below SQLite's bound-parameter limit
+    SQL_BATCH = 500
+
+    def __init__(self, model_name, cache_dir=None, max_memory_items=2048, shard_size=1024, max_shards=64):
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self.shard_size = shard_size
+        self.max_shards = max_shards
+
+        self.cache_dir = None
+        if cache_dir:
+            slug = "".join(c if c.isalnum() or c in "-_." else "_" for c in model_name)
+            self.cache_dir = os.path.join(cache_dir, slug)
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+        self._shards = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+    # ------------------ Public API ------------------
+
+    def key(self, text):
+        normalized = " ".join((text or "").split())
+        return hashlib.sha256(f"{self.model_name}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def encode(self, texts, encode_fn):
+        """
+        Returns a (len(texts), dim) float32 array. Texts that are not cached are
+        passed to encode_fn in a single call and stored afterwards.
+        """
+        keys = [self.key(t) for t in texts]
+        vectors = self.get_many(keys)
+
+        missing = {}
+        for i, (k, vec) in enumerate(zip(keys, vectors)):
+            if vec is None:
+                missing.setdefault(k, []).append(i)
+
+        if missing:
+            missing_keys = list(missing)
+            encoded = np.asarray(encode_fn([texts[missing[k][0]] for k in missing_keys]), dtype=np.float32)
+            for k, vec in zip(missing_keys, encoded):
+                for i in missing[k]:
+                    vectors[i] = vec
+            self.put_many(missing_keys, encoded)
+
+        return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def get_many(self, keys):
+        results = []
+        with self._lock:
+            for k in keys:
+                vec = self._memory.get(k)
+                if vec is not None:
+                    self._memory.move_to_end(k)
+                    self.memory_hits += 1
+                results.append(vec)
+
+            # Everything the memory tier missed is looked up on disk in one query
+            on_disk = self._disk_get_many([k for k, vec in zip(keys, results) if vec is None])
+            for i, k in enumerate(keys):
+                if results[i] is not None:
+                    continue
+                vec = on_disk.get(k)
+                if vec is not None:
+                    self.disk_hits += 1
+                    self._memory_put(k, vec)
+                else:
+                    self.misses += 1
+                results[i] = vec
+        return results
+
+    def put_many(self, keys, vectors):
+        with self._lock:
+            for k, vec in zip(keys, vectors):
+                self._memory_put(k, vec)
+            if self.cache_dir:
+                try:
+                    self._disk_put(keys, vectors)
+                except (sqlite3.Error, OSError):
+                    # The vectors are already in memory; a failed disk write only costs a later re-encode
+                    pass
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        with self._lock:
+            disk_items = 0
+            if self.cache_dir:
+                try:
+                    disk_items = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                except sqlite3.Error:
+                    disk_items = None
+            memory_items = len(self._memory)
+        return {
+            "model": self.model_name,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+            "memory_items": memory_items,
+            "disk_items": disk_items
+        }
+
+    # ------------------ Memory tier ------------------
+
+    def _memory_put(self, key, vec):
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.memory_evictions += 1
+
+    # ------------------ Disk tier ------------------
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _shard_path(self, shard_id):
+        return self._path(f"shard_{shard_id:05d}.npy")
+
+    def _connect(self):
+        # Callers hold self._lock; one connection per cache, shared by its threads
+        if self._db is None:
+            db = sqlite3.connect(self._path(self.INDEX_FILE), timeout=30, isolation_level=None, check_same_thread=False)
+            # WAL lets lookups from every worker run while one of them writes
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, shard INTEGER NOT NULL, row INTEGER NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_shard ON entries (shard)")
+            db.execute("CREATE TABLE IF NOT EXISTS shards (id INTEGER PRIMARY KEY)")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+            self._db = db
+        return self._db
+
+    def _open_shard(self, shard_id):
+        shard = self._shards.get(shard_id)
+        if shard is None:
+            shard = np.load(self._shard_path(shard_id), mmap_mode="r")
+            self._shards[shard_id] = shard
+            # Shards are evicted oldest first, so drop the oldest maps once there are too many
+            while len(self._shards) > self.max_shards:
+                del self._shards[min(self._shards)]
+        return shard
+
+    def _disk_get_many(self, keys):
+        """{key: vector} for the keys found on disk."""
+        if not self.cache_dir or not keys:
+            return {}
+        found = {}
+        try:
+            db = self._connect()
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), self.SQL_BATCH):
+                chunk = unique[start:start + self.SQL_BATCH]
+                rows = db.execute(
+                    f"SELECT key, shard, row FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, shard_id, row in rows:
+                    try:
+                        found[key] = np.array(self._open_shard(shard_id)[row], dtype=np.float32)
+                    except (OSError, ValueError):
+                        # A shard evicted between the lookup and the read is just a miss
+                        pass
+        except sqlite3.Error:
+            return found
+        return found
+
+    def _disk_put(self, keys, vectors):
+        dim = int(vectors.shape[1])
+        db = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front, so writers from all workers are serialized
+            db.execute("BEGIN IMMEDIATE")
+            meta = dict(db.execute("SELECT name, value FROM meta").fetchall())
+            if meta.get("dim") is None:
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (dim,))
+            elif meta["dim"] != dim:
+                db.execute("ROLLBACK")
+                return
+            next_row = meta.get("next_row", 0)
+            next_shard = meta.get("next_shard", 0)
+            current = db.execute("SELECT MAX(id) FROM shards").fetchone()[0]
+
+            existing = set()
+            for start in range(0, len(keys), self.SQL_BATCH):
+                chunk = list(keys[start:start + self.SQL_BATCH])
+                existing.update(k for (k,) in db.execute(
+                    f"SELECT key FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ))
+
+            writable = None
+            rows = []
+            for key, vec in zip(keys, vectors):
+                if key in existing:
+                    continue
+                existing.add(key)
+                if current is None or next_row >= self.shard_size:
+                    if writable is not None:
+                        writable.flush()
+                    # Insert pending rows first, so evicting their shard below also drops them
+                    db.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+                    rows = []
+                    current, next_shard = next_shard, next_shard + 1
+                    writable = self._new_shard(db, current, dim)
+                    next_row = 0
+                elif writable is None:
+                    writable = np.load(self._shard_path(current), mmap_mode="r+")
+                writable[next_row] = vec
+                rows.append((key, current, next_row))
+                next_row += 1
+
+            if writable is not None:
+                # Entries only become visible at COMMIT, after their vectors are flushed
+                writable.flush()
+                del writable
+            db.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+            db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [("next_row", next_row), ("next_shard", next_shard)])
+            db.execute("COMMIT")
+        except Exception:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+
+    def _new_shard(self, db, shard_id, dim):
+        np.lib.format.open_memmap(self._shard_path(shard_id), mode="w+", dtype=np.float32,
+                                  shape=(self.shard_size, dim)).flush()
+        db.execute("INSERT INTO shards VALUES (?)", (shard_id,))
+
+        # Evict whole shards, oldest first, once the store is over its budget
+        shard_ids = [s for (s,) in db.execute("SELECT id FROM shards ORDER BY id")]
+        for evicted in shard_ids[:max(0, len(shard_ids) - self.max_shards)]:
+            self.disk_evictions += db.execute("DELETE FROM entries WHERE shard = ?", (evicted,)).rowcount
+            db.execute("DELETE FROM shards WHERE id = ?", (evicted,))
+            self._shards.pop(evicted, None)
+            try:
+                os.remove(self._shard_path(evicted))
+            except OSError:
+                pass
+        return np.load(self._shard_path(shard_id), mmap_mode="r+")
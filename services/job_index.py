@@ -0,0 +1,253 @@
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl  # Not available on Windows, the index is then single-process only
+except ImportError:
+    fcntl = None
+
+
+def job_posting_text(job):
+    """
+    Build the text used to match a job posting against a resume
+    """
+    parts = [job.get('title'), job.get('company'), job.get('location'), job.get('description')]
+    skills = job.get('required_skills') or []
+    if skills:
+        parts.append(", ".join(skills))
+    return " ".join(p for p in parts if p)
+
+
+def job_key(job):
+    """
+    Stable identity for a job: the Job table id, the posting link, or a hash of its text
+    """
+    if job.get('id') is not None:
+        return f"db:{job['id']}"
+    if job.get('link'):
+        return f"link:{job['link'].split('?')[0]}"
+    return "text:" + hashlib.sha256(job_posting_text(job).encode("utf-8")).hexdigest()
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+class JobIndex:
+    """
+    Vector index of job postings for resume-to-job matching.
+
+    Jobs are stored as a flat matrix of unit vectors, so an exact search is a
+    single matrix-vector product. For large indexes an IVF-style approximate
+    mode clusters the vectors with spherical k-means and only scores the jobs
+    in the nprobe clusters closest to the query.
+
+    The index is persisted under index_dir as a single index.npz holding the
+    vectors, the IVF lists and the entries, replaced atomically on every write,
+    and updated incrementally: upsert() only encodes jobs that are new or whose
+    text changed. Writers hold an exclusive flock for the whole
+    read-modify-write, so concurrent upserts from several worker processes
+    don't drop each other's jobs. Other processes pick up the new file on
+    their next search.
+    """
+
+    INDEX_FILE = "index.npz"
+    LOCK_FILE = "index.lock"
+
+    def __init__(self, index_dir, encode_fn, ivf_min_size=2000, nprobe=4):
+        self.index_dir = index_dir
+        self.encode_fn = encode_fn
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+
+        self._lock = threading.RLock()
+        self._loaded_version = None
+        self.entries = []  # [{"key", "hash", "job"}], row i of vectors belongs to entries[i]
+        self.vectors = None
+        self.centroids = None
+        self.assignments = None
+        self._trained_size = 0
+
+    # ------------------ Public API ------------------
+
+    def __len__(self):
+        with self._lock:
+            self._reload_if_changed()
+            return len(self.entries)
+
+    def upsert(self, jobs):
+        """Adds new jobs and re-encodes changed ones; returns the number of rows written."""
+        with self._lock, self._file_lock(exclusive=True):
+            # Under the lock, so another process's upsert since our last read is included
+            self._load_if_changed()
+            positions = {entry["key"]: i for i, entry in enumerate(self.entries)}
+
+            pending = {}
+            for job in jobs:
+                text = job_posting_text(job)
+                if not text:
+                    continue
+                key = job_key(job)
+                text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                i = positions.get(key)
+                if i is not None and self.entries[i]["hash"] == text_hash:
+                    continue
+                pending[key] = (job, text, text_hash)
+
+            if not pending:
+                return 0
+
+            keys = list(pending)
+            new_vectors = _normalize(self.encode_fn([pending[k][1] for k in keys]))
+
+            appended = []
+            for key, vector in zip(keys, new_vectors):
+                job, _, text_hash = pending[key]
+                entry = {"key": key, "hash": text_hash, "job": job}
+                if key in positions:
+                    self.entries[positions[key]] = entry
+                    self.vectors[positions[key]] = vector
+                else:
+                    self.entries.append(entry)
+                    appended.append(vector)
+
+            if appended:
+                appended = np.vstack(appended)
+                self.vectors = appended if self.vectors is None else np.vstack([self.vectors, appended])
+
+            self._update_ivf()
+            self._save()
+            return len(keys)
+
+    def search(self, vector, k=10, mode="auto"):
+        """
+        Returns up to k (score, job) pairs, best first. mode is "flat" (exact),
+        "ivf" (approximate) or "auto", which uses IVF once the index is large
+        enough to have been clustered.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            if self.vectors is None or not len(self.entries):
+                return []
+
+            query = _normalize(np.asarray(vector).reshape(1, -1))[0]
+            use_ivf = mode == "ivf" or (mode == "auto" and len(self.entries) >= self.ivf_min_size)
+            if use_ivf and self.centroids is None:
+                self._train_ivf()
+
+            if use_ivf and self.centroids is not None:
+                probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+                candidates = np.flatnonzero(np.isin(self.assignments, probes))
+            else:
+                candidates = np.arange(len(self.entries))
+
+            scores = self.vectors[candidates] @ query
+            k = min(k, len(candidates))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self.entries[candidates[i]]["job"]) for i in top]
+
+    # ------------------ IVF ------------------
+
+    def _update_ivf(self):
+        if len(self.entries) < self.ivf_min_size:
+            self.centroids = None
+            self.assignments = None
+            return
+        # Re-cluster when the index has doubled since the last training, otherwise
+        # just assign the rows that arrived since then to their nearest centroid
+        if self.centroids is None or len(self.entries) >= 2 * self._trained_size:
+            self._train_ivf()
+        else:
+            assigned = len(self.assignments)
+            if assigned < len(self.entries):
+                extra = np.argmax(self.vectors[assigned:] @ self.centroids.T, axis=1)
+                self.assignments = np.concatenate([self.assignments, extra])
+            # Rows whose vectors were replaced keep their old list; close enough until the next re-cluster
+
+    def _train_ivf(self, iterations=10, seed=0):
+        n = len(self.entries)
+        nlist = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(n, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(self.vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = self.vectors[assignments == c]
+                if len(members):
+                    centroids[c] = _normalize(members.mean(axis=0, keepdims=True))[0]
+        self.centroids = centroids
+        self.assignments = np.argmax(self.vectors @ centroids.T, axis=1)
+        self._trained_size = n
+
+    # ------------------ Persistence ------------------
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive):
+        os.makedirs(self.index_dir, exist_ok=True)
+        lock_file = open(self._path(self.LOCK_FILE), "a")
+        try:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _reload_if_changed(self):
+        if not os.path.exists(self._path(self.INDEX_FILE)):
+            return
+        with self._file_lock(exclusive=False):
+            self._load_if_changed()
+
+    def _load_if_changed(self):
+        # Callers hold the file lock; flock is per open file, so this must not take it again
+        try:
+            f = open(self._path(self.INDEX_FILE), "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            # Every save is a new file, so inode and mtime identify the version we hold
+            st = os.fstat(f.fileno())
+            version = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if version == self._loaded_version:
+                return
+            with np.load(f) as data:
+                self.entries = json.loads(data["entries"].tobytes().decode("utf-8"))
+                self._trained_size = int(data["trained_size"])
+                self.vectors = data["vectors"] if self.entries else None
+                self.centroids = data["centroids"] if "centroids" in data.files else None
+                self.assignments = data["assignments"] if "assignments" in data.files else None
+            self._loaded_version = version
+
+    def _save(self):
+        # Callers hold the exclusive file lock. One file, so readers never see
+        # vectors and entries from different writes
+        arrays = {
+            "vectors": self.vectors,
+            "entries": np.frombuffer(json.dumps(self.entries, default=str).encode("utf-8"), dtype=np.uint8),
+            "trained_size": np.array(self._trained_size)
+        }
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+            arrays["assignments"] = self.assignments
+
+        tmp_path = self._path(self.INDEX_FILE) + f".{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, self._path(self.INDEX_FILE))
+        st = os.stat(self._path(self.INDEX_FILE))
+        self._loaded_version = (st.st_ino, st.st_mtime_ns, st.st_size)
@@ -0,0 +1,35 @@
+import json
+import hashlib
+
+from database.db import SessionLocal
+from database.models import LLMResponseCache as LLMResponseCacheEntry
+from services.db_cache import DatabaseTTLCache
+
+
+class LLMResponseCache(DatabaseTTLCache):
+    """
+    Database-backed cache of post-processed LLM responses.
+
+    Keys are a SHA-256 over the model name, the generation config and the hash
+    of the prompt.
+    """
+
+    entry_model = LLMResponseCacheEntry
+    value_column = "response"
+    name = "LLM cache"
+
+    def __init__(self, ttl_seconds=7 * 24 * 3600, max_entries=5000, session_factory=SessionLocal):
+        super().__init__(ttl_seconds, max_entries, session_factory)
+
+    def make_key(self, model, config, prompt):
+        if hasattr(config, "model_dump"):
+            config = config.model_dump(mode="json", exclude_none=True)
+        payload = json.dumps({
+            "model": model,
+            "config": config,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def set(self, key, model, response):
+        self._store(key, response, model=model)
@@ -0,0 +1,572 @@
+"""
+Local, layout-aware resume parser built on PyMuPDF.
+
+Text is read as spans with their font size and weight. Columns are read one
+after the other. Section headings are recognised by their wording and
+styling, and the entries in each section are split on bold lines, date
+ranges and bullets. Contact details come from regexes and skills from a
+dictionary. The output has the same JSON shape as the Gemini parser plus a
+"confidence" mapping (0..1 per field and "overall") that ResumeParser uses
+to decide whether Gemini is needed at all.
+"""
+import re
+import statistics
+
+import fitz  # PyMuPDF
+
+# ------------------ Vocabulary ------------------
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "career summary", "profile", "professional profile",
+                "about", "about me", "objective", "career objective"],
+    "education": ["education", "academic background", "academics", "academic qualifications",
+                  "education and training", "qualifications"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship experience",
+                   "relevant experience"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "technologies",
+               "skills and tools", "tools and technologies", "technical proficiencies", "tech stack"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects"],
+    # Sections the parser does not extract; they only end the section before them
+    "other": ["certifications", "certificates", "achievements", "awards", "honors", "honors and awards",
+              "publications", "volunteer", "volunteering", "volunteer experience", "extracurriculars",
+              "extracurricular activities", "activities", "leadership", "interests", "hobbies",
+              "languages", "references", "courses", "coursework", "relevant coursework",
+              "positions of responsibility", "declaration"]
+}
+_HEADING_LOOKUP = {name: section for section, names in SECTION_HEADINGS.items() for name in names}
+
+SKILL_DICTIONARY = {
+    "Programming Languages": ["Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go", "Rust",
+                              "Ruby", "PHP", "Swift", "Kotlin", "Scala", "R", "MATLAB", "SQL", "Bash",
+                              "Dart", "Perl", "HTML", "CSS"],
+    "Frameworks": ["React", "Angular", "Vue.js", "Next.js", "Node.js", "Express", "Django", "Flask",
+                   "FastAPI", "Spring", "Spring Boot", "Rails", ".NET", "Laravel", "Flutter",
+                   "React Native", "jQuery", "Bootstrap", "Tailwind CSS", "GraphQL", "REST API"],
+    "Databases": ["PostgreSQL", "MySQL", "SQLite", "MongoDB", "Redis", "Cassandra", "DynamoDB",
+                  "Elasticsearch", "Oracle", "SQL Server", "Firebase", "Snowflake", "BigQuery"],
+    "Cloud & DevOps": ["AWS", "Azure", "Google Cloud Platform", "Docker", "Kubernetes", "Terraform",
+                       "Ansible", "Jenkins", "GitHub Actions", "CI/CD", "Linux", "Nginx", "Heroku"],
+    "Data & ML": ["Machine Learning", "Deep Learning", "Natural Language Processing", "Computer Vision",
+                  "TensorFlow", "PyTorch", "Keras", "scikit-learn", "Pandas", "NumPy", "Matplotlib",
+                  "Seaborn", "Spark", "Hadoop", "Airflow", "Kafka", "Tableau", "Power BI", "OpenCV",
+                  "Hugging Face", "LangChain"],
+    "Tools": ["Git", "GitHub", "GitLab", "Jira", "Figma", "Postman", "VS Code", "Excel"]
+}
+_SKILL_ALIASES = {
+    "js": "JavaScript", "ts": "TypeScript", "py": "Python", "golang": "Go", "reactjs": "React",
+    "react.js": "React", "nodejs": "Node.js", "node": "Node.js", "vue": "Vue.js", "vuejs": "Vue.js",
+    "nextjs": "Next.js", "expressjs": "Express", "express.js": "Express", "postgres": "PostgreSQL",
+    "mongo": "MongoDB", "gcp": "Google Cloud Platform", "google cloud": "Google Cloud Platform",
+    "amazon web services": "AWS", "k8s": "Kubernetes", "ml": "Machine Learning",
+    "dl": "Deep Learning", "nlp": "Natural Language Processing", "cv": "Computer Vision",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn", "tailwind": "Tailwind CSS",
+    "restful api": "REST API", "rest apis": "REST API", "rest": "REST API", "ci cd": "CI/CD",
+    "powerbi": "Power BI", "html5": "HTML", "css3": "CSS", "springboot": "Spring Boot",
+    "ms excel": "Excel", "vscode": "VS Code", "huggingface": "Hugging Face"
+}
+_SKILLS = {}
+for _category, _names in SKILL_DICTIONARY.items():
+    for _name in _names:
+        _SKILLS[_name.lower()] = (_name, _category)
+for _alias, _name in _SKILL_ALIASES.items():
+    _SKILLS[_alias] = _SKILLS[_name.lower()]
+# Names that are too short or too common to trust outside a skills section
+_SCAN_SKILLS = sorted((k for k in _SKILLS if len(k) > 2 and k not in ("rest", "node", "excel")), key=len, reverse=True)
+_SKILL_SCAN = re.compile(r"(?<![\w+#.])(" + "|".join(re.escape(k) for k in _SCAN_SKILLS) + r")(?![\w+#])", re.IGNORECASE)
+
+_JOB_TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|intern|manager|analyst|scientist|designer|consultant|lead|architect|associate|"
+    r"specialist|assistant|researcher|director|officer|administrator|coordinator|programmer|head|"
+    r"founder|co-founder|trainee|fellow|tutor|teacher|technician|executive|member)\b", re.IGNORECASE)
+_INSTITUTION_WORDS = re.compile(r"\b(university|college|institute|school|academy|polytechnic|iit|nit|iiit)\b", re.IGNORECASE)
+_DEGREE = re.compile(
+    r"\b(bachelor(?:'s)?(?: of [a-z]+)?|master(?:'s)?(?: of [a-z]+)?|doctor of [a-z]+|ph\.?\s?d\.?|mba|"
+    r"b\.?\s?tech|m\.?\s?tech|b\.?\s?e\.?|m\.?\s?e\.?|b\.?\s?sc?\.?|m\.?\s?sc?\.?|b\.?\s?a\.?|m\.?\s?a\.?|"
+    r"bca|mca|diploma|associate(?:'s)? degree|high school|secondary school|higher secondary)(?=[\s,.(]|$)",
+    re.IGNORECASE)
+
+# ------------------ Regexes ------------------
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?<![\w])(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)[\s.-]?)?\d{2,5}[\s.-]?\d{3,5}(?:[\s.-]?\d{2,5})?(?![\w])")
+LINKEDIN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w\-%]+/?", re.IGNORECASE)
+GITHUB = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w\-]+/?(?![\w/])", re.IGNORECASE)
+URL = re.compile(r"(?:https?://[^\s|,;]+|(?:www\.)?[\w-]+\.(?:dev|io|me|com|net|org|app|site|xyz|in|tech)(?:/[^\s|,;]*)?)(?![\w@])", re.IGNORECASE)
+LOCATION = re.compile(r"^[A-Z][A-Za-z .'-]+,\s*[A-Z][A-Za-z .'-]+$")
+GPA = re.compile(r"\b(?:c?gpa|grade)\s*[:\-]?\s*(\d{1,2}(?:\.\d{1,2})?)(?:\s*/\s*\d{1,2}(?:\.\d+)?)?", re.IGNORECASE)
+
+_MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8,
+           "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH},?\s+\d{{4}}|\d{{1,2}}[/.-]\d{{4}}|\d{{4}}[/.-]\d{{1,2}}|\d{{4}})"
+DATE_RANGE = re.compile(rf"({_DATE})\s*(?:-|–|—|to|until)\s*({_DATE}|present|current|now|ongoing|till date|date)", re.IGNORECASE)
+SINGLE_DATE = re.compile(rf"(?<!\d)({_DATE})(?!\d)", re.IGNORECASE)
+_OPEN_ENDED = ("present", "current", "now", "ongoing", "till date", "date")
+
+_BULLETS = "•●▪◦‣∙·■□►▶✓✔➢➤-–*o"
+_CONTACT_SEPARATORS = re.compile(r"\s*[|•·∙◦▪]\s*|\s{3,}")
+_LABELLED = re.compile(r"^[A-Z][\w &/]{1,25}:\s")
+_SEPARATORS = re.compile(r"\s*(?:\||•|·|∙|◦|▪|,\s(?=[A-Z])|\s[-–—]\s|\s{3,}|\bat\b|@(?=\s))\s*")
+
+# Minimum text for a PDF to count as text-based; scanned PDFs have next to none
+MIN_TEXT_CHARS = 200
+
+
+def to_iso_date(text):
+    """'Sep 2018', '09/2018', '2018-09' or '2018' as 'YYYY-MM-01'; None if unparseable."""
+    text = text.strip().lower().rstrip(".")
+    match = re.match(rf"({_MONTH}),?\s+(\d{{4}})$", text)
+    if match:
+        return f"{match.group(2)}-{_MONTHS[match.group(1)[:3]]:02d}-01"
+    match = re.match(r"(\d{1,2})[/.-](\d{4})$", text)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return f"{match.group(2)}-{int(match.group(1)):02d}-01"
+    match = re.match(r"(\d{4})[/.-](\d{1,2})$", text)
+    if match and 1 <= int(match.group(2)) <= 12:
+        return f"{match.group(1)}-{int(match.group(2)):02d}-01"
+    match = re.match(r"(\d{4})$", text)
+    if match and 1950 <= int(match.group(1)) <= 2100:
+        return f"{match.group(1)}-01-01"
+    return None
+
+
+def find_dates(text):
+    """(start, end, current, text without the dates)."""
+    match = DATE_RANGE.search(text)
+    if match:
+        end_text = match.group(2).lower()
+        current = end_text in _OPEN_ENDED
+        rest = text[:match.start()] + " " + text[match.end():]
+        return to_iso_date(match.group(1)), None if current else to_iso_date(match.group(2)), current, _strip_separators(rest)
+    match = SINGLE_DATE.search(text)
+    if match and to_iso_date(match.group(1)):
+        rest = text[:match.start()] + " " + text[match.end():]
+        return None, to_iso_date(match.group(1)), False, _strip_separators(rest)
+    return None, None, False, text
+
+
+def _strip_separators(text):
+    text = re.sub(r"\(\s*\)", "", text)
+    return re.sub(r"^[\s|,•·–—-]+|[\s|,•·–—-]+$", "", re.sub(r"\s{2,}", " ", text))
+
+
+# ------------------ Layout ------------------
+
+class Line:
+    __slots__ = ("text", "size", "bold", "page", "y")
+
+    def __init__(self, text, size, bold, page, y):
+        self.text = text
+        self.size = size
+        self.bold = bold
+        self.page = page
+        self.y = y
+
+    def __repr__(self):
+        return f"Line({self.text!r}, size={self.size:.1f}, bold={self.bold})"
+
+
+def _ordered_blocks(page):
+    blocks = [b for b in page.get_text("dict")["blocks"] if b.get("type") == 0]
+    width = page.rect.width
+    # Two columns when enough narrow blocks start right of the middle; read the left one first
+    right = [b for b in blocks if b["bbox"][0] > width * 0.4 and (b["bbox"][2] - b["bbox"][0]) < width * 0.55]
+    if len(right) >= 3 and len(right) < len(blocks):
+        left = [b for b in blocks if b not in right]
+        return sorted(left, key=lambda b: b["bbox"][1]) + sorted(right, key=lambda b: b["bbox"][1])
+    return sorted(blocks, key=lambda b: (round(b["bbox"][1]), b["bbox"][0]))
+
+
+def extract_lines(doc):
+    """Lines in reading order with their largest font size and whether they are bold."""
+    lines = []
+    for page_number, page in enumerate(doc):
+        for block in _ordered_blocks(page):
+            for line in block["lines"]:
+                spans = [s for s in line["spans"] if s["text"].strip()]
+                if not spans:
+                    continue
+                text = re.sub(r"\s+", " ", "".join(s["text"] for s in line["spans"])).strip()
+                # Lines of one block that share a baseline (e.g. title left, dates right) are merged
+                if lines and lines[-1].page == page_number and abs(lines[-1].y - line["bbox"][1]) < 1.5 and block["lines"][0] is not line:
+                    lines[-1].text += "  " + text
+                    continue
+                size = max(s["size"] for s in spans)
+                chars = sum(len(s["text"].strip()) for s in spans)
+                bold_chars = sum(len(s["text"].strip()) for s in spans if s["flags"] & 16 or "bold" in s["font"].lower())
+                lines.append(Line(text, size, bold_chars >= chars * 0.6, page_number, line["bbox"][1]))
+    return lines
+
+
+def _body_size(lines):
+    sizes = [round(line.size, 1) for line in lines for _ in range(min(len(line.text), 200))]
+    return statistics.median(sizes) if sizes else 10.0
+
+
+def _heading_key(text):
+    text = text.strip().rstrip(":").strip()
+    # "E X P E R I E N C E" style headings
+    if re.fullmatch(r"(?:\S ){3,}\S", text):
+        text = text.replace(" ", "")
+    return re.sub(r"[^a-z& ]", "", text.lower().replace("&", " and ")).strip()
+
+
+def _classify_heading(line, body_size):
+    if len(line.text) > 45 or len(line.text.split()) > 5:
+        return None
+    section = _HEADING_LOOKUP.get(_heading_key(line.text))
+    if section:
+        return section
+    styled = line.size >= body_size * 1.25 or (line.bold and line.text.isupper())
+    if styled and not DATE_RANGE.search(line.text) and not EMAIL.search(line.text):
+        return "other"
+    return None
+
+
+def split_sections(lines, body_size):
+    """Returns (header lines, {section: [lines]}); the header is everything before the first heading."""
+    header, sections, current = [], {}, None
+    for line in lines:
+        # Above the first known heading only known headings count: name and title lines are styled too
+        section = _classify_heading(line, body_size) if current is not None else _HEADING_LOOKUP.get(_heading_key(line.text))
+        if section:
+            current = section
+            sections.setdefault(section, [])
+            continue
+        if current is None:
+            header.append(line)
+        else:
+            sections[current].append(line)
+    sections.pop("other", None)
+    return header, sections
+
+
+def layout_text(pdf_data):
+    """
+    The PDF's text in reading order as compact plain text for an LLM prompt:
+    one line per layout line, section headings prefixed with "## " and
+    bullets normalised to "- ".
+    """
+    with fitz.open(stream=pdf_data, filetype="pdf") as doc:
+        lines = extract_lines(doc)
+    body_size = _body_size(lines)
+    out, seen_heading = [], False
+    for line in lines:
+        heading = _classify_heading(line, body_size) if seen_heading else _HEADING_LOOKUP.get(_heading_key(line.text))
+        if heading:
+            seen_heading = True
+            out.append("## " + line.text.rstrip(":"))
+        elif _is_bullet(line.text):
+            out.append("- " + _strip_bullet(line.text))
+        else:
+            out.append(line.text)
+    return "\n".join(out)
+
+
+def _is_bullet(text):
+    return len(text) > 1 and text[0] in _BULLETS and (text[1] == " " or text[0] not in "-*o")
+
+
+def _strip_bullet(text):
+    return text[1:].strip() if _is_bullet(text) else text
+
+
+def split_entries(lines):
+    """
+    Groups section lines into entries of {"header": [...], "body": [...], "bullets": [...]}.
+    An entry starts with a bold or dated line once the previous one has content;
+    unbulleted lines after a bullet are its wrapped continuation.
+    """
+    entries = []
+    current = None
+    for line in lines:
+        text = line.text
+        dated = bool(DATE_RANGE.search(text))
+        if _is_bullet(text):
+            if current is None:
+                current = {"header": [], "body": [], "bullets": [], "dated": False}
+                entries.append(current)
+            current["bullets"].append(_strip_bullet(text))
+            continue
+        starts_entry = current is None or (
+            (current["bullets"] or current["body"]) and (line.bold or dated)
+        ) or (dated and current["dated"])
+        if starts_entry:
+            current = {"header": [], "body": [], "bullets": [], "dated": False}
+            entries.append(current)
+        if current["bullets"]:
+            if _LABELLED.match(text):
+                current["body"].append(text)
+            else:
+                current["bullets"][-1] += " " + text
+        elif not current["body"] and (line.bold or dated or len(text.split()) <= 10) and len(current["header"]) < 3:
+            current["header"].append(text)
+        else:
+            current["body"].append(text)
+        current["dated"] = current["dated"] or dated
+    return entries
+
+
+def _parts(texts):
+    parts = []
+    for text in texts:
+        parts.extend(p for p in (_strip_separators(p) for p in _SEPARATORS.split(text)) if p)
+    return parts
+
+
+# ------------------ Sections ------------------
+
+def parse_personal_info(header, lines, body_size):
+    text = "\n".join(line.text for line in header) or "\n".join(line.text for line in lines[:15])
+    all_text = "\n".join(line.text for line in lines)
+    info = {"full_name": "", "email": "", "phone": "", "location": "", "linkedin": "", "github": "", "portfolio": ""}
+    confidence = {}
+
+    in_header = EMAIL.search(text)
+    email = in_header or EMAIL.search(all_text)
+    info["email"] = email.group(0) if email else ""
+    confidence["email"] = 1.0 if in_header else (0.8 if email else 0.2)
+
+    phone = next((m.group(0).strip() for m in PHONE.finditer(text) if 9 <= len(re.sub(r"\D", "", m.group(0))) <= 15), "")
+    info["phone"] = phone
+    confidence["phone"] = 0.9 if phone else 0.5
+
+    for field, pattern in (("linkedin", LINKEDIN), ("github", GITHUB)):
+        match = pattern.search(text) or pattern.search(all_text)
+        info[field] = _as_url(match.group(0)) if match else ""
+        confidence[field] = 1.0 if match else 0.7
+    for match in URL.finditer(text):
+        url = match.group(0)
+        if "linkedin.com" in url.lower() or "github.com" in url.lower() or (email and url in email.group(0)):
+            continue
+        info["portfolio"] = _as_url(url)
+        break
+    confidence["portfolio"] = 1.0 if info["portfolio"] else 0.7
+
+    # The name is the largest line at the top; failing that, the first name-like line that isn't a job title
+    top = max(header[:6], key=lambda line: line.size, default=None)
+    if top is not None and _looks_like_name(top.text):
+        name_line = top
+        confidence["full_name"] = 0.95 if top.size > body_size * 1.3 else 0.7
+    else:
+        name_line = next((line for line in header[:6] if _looks_like_name(line.text) and not _JOB_TITLE_WORDS.search(line.text)), None)
+        confidence["full_name"] = 0.6 if name_line else 0.0
+    if name_line is not None:
+        info["full_name"] = name_line.text.title() if name_line.text.isupper() else name_line.text
+
+    for line in header:
+        part = next((p for p in _CONTACT_SEPARATORS.split(line.text) if LOCATION.match(p.strip()) and len(p) < 40), None)
+        if part:
+            info["location"] = part.strip()
+            break
+    confidence["location"] = 0.7 if info["location"] else 0.5
+    return info, confidence
+
+
+def _as_url(text):
+    return text if text.lower().startswith("http") else "https://" + text
+
+
+def _looks_like_name(text):
+    words = text.split()
+    return (2 <= len(words) <= 5 and all(re.fullmatch(r"[A-Za-z][A-Za-z.'-]*", w) for w in words)
+            and not _HEADING_LOOKUP.get(_heading_key(text)))
+
+
+def parse_summary(sections, header):
+    lines = sections.get("summary")
+    if lines:
+        return " ".join(_strip_bullet(line.text) for line in lines), 0.9
+    # An untitled paragraph under the contact lines
+    paragraph = [line.text for line in header if len(line.text.split()) >= 8 and not EMAIL.search(line.text)]
+    if paragraph:
+        return " ".join(paragraph), 0.5
+    return "", 0.6
+
+
+def parse_experience(lines):
+    results = []
+    for entry in split_entries(lines):
+        start, end, current, header_parts = None, None, False, []
+        for text in entry["header"]:
+            s, e, c, rest = find_dates(text)
+            if s or e:
+                start, end, current = s, e, c
+            if rest:
+                header_parts.append(rest)
+        parts = _parts(header_parts)
+        position = next((p for p in parts if _JOB_TITLE_WORDS.search(p)), "")
+        location = next((p for p in parts if p != position and LOCATION.match(p) and len(p) < 40), "")
+        company = next((p for p in parts if p not in (position, location)), "")
+        if not company and not position and not entry["bullets"]:
+            continue
+        results.append({
+            "company": company,
+            "position": position,
+            "location": location,
+            "start_date": start,
+            "end_date": end,
+            "current": current,
+            "description": " ".join(entry["body"]),
+            "achievements": entry["bullets"]
+        })
+    return results
+
+
+def parse_education(lines):
+    results = []
+    for entry in split_entries(lines):
+        start, end, texts = None, None, []
+        for text in entry["header"] + entry["body"]:
+            s, e, _, rest = find_dates(text)
+            if s or e:
+                start, end = s or start, e or end
+            if rest:
+                texts.append(rest)
+        parts = _parts(texts)
+        institution = next((p for p in parts if _INSTITUTION_WORDS.search(p)), "")
+        degree_part = next((p for p in parts if _DEGREE.search(p) and p != institution), "")
+        degree, field = degree_part, ""
+        split = re.split(r"\s+in\s+|\s*[,(]\s*", degree_part, maxsplit=1)
+        if len(split) == 2:
+            degree, field = split[0].strip(), split[1].strip(" )")
+        gpa_match = GPA.search(" ".join(texts + entry["bullets"]))
+        description = [p for p in parts if p not in (institution, degree_part) and not GPA.search(p)] + entry["bullets"]
+        if not institution and not degree:
+            continue
+        results.append({
+            "institution": institution,
+            "degree": degree,
+            "field_of_study": field,
+            "start_date": start,
+            "end_date": end,
+            "gpa": float(gpa_match.group(1)) if gpa_match else None,
+            "description": " ".join(description)
+        })
+    return results
+
+
+def _skill(token, category=None):
+    known = _SKILLS.get(token.lower())
+    if known:
+        return {"name": known[0], "category": known[1], "proficiency": ""}
+    return {"name": token, "category": category or "Other", "proficiency": ""}
+
+
+def parse_skills(sections, lines):
+    """Returns (skills, confidence). Without a skills section, dictionary terms are picked from the whole text."""
+    skills, seen = [], set()
+
+    def add(skill):
+        if skill["name"].lower() not in seen:
+            seen.add(skill["name"].lower())
+            skills.append(skill)
+
+    section = sections.get("skills")
+    if section:
+        for line in section:
+            text = _strip_bullet(line.text)
+            category = None
+            if ":" in text:
+                category, text = (t.strip() for t in text.split(":", 1))
+            for token in re.split(r"\s*[,;|•·/]\s*|\s{2,}", text):
+                token = token.strip(" .()")
+                if token and len(token.split()) <= 4 and len(token) <= 40:
+                    add(_skill(token, category))
+        known = sum(1 for s in skills if s["name"].lower() in _SKILLS)
+        return skills, 0.9 if skills and known >= len(skills) / 3 else (0.6 if skills else 0.3)
+
+    for match in _SKILL_SCAN.finditer("\n".join(line.text for line in lines)):
+        add(_skill(match.group(1)))
+    return skills, 0.4 if skills else 0.2
+
+
+def parse_projects(lines):
+    results = []
+    for entry in split_entries(lines):
+        start, end, texts = None, None, []
+        for text in entry["header"]:
+            s, e, _, rest = find_dates(text)
+            if s or e:
+                start, end = s or start, e or end
+            if rest:
+                texts.append(rest)
+        all_text = " ".join(entry["header"] + entry["body"] + entry["bullets"])
+        link = URL.search(all_text)
+        technologies = []
+        body = []
+        for text in entry["body"] + entry["bullets"]:
+            stack = re.match(r"(?:tech(?:nologies| stack)?|built with|tools|stack)\s*:\s*(.*)", text, re.IGNORECASE)
+            if stack:
+                technologies.extend(t.strip(" .") for t in re.split(r"\s*[,;|/]\s*", stack.group(1)) if t.strip(" ."))
+            else:
+                body.append(text)
+        if not technologies:
+            technologies = list(dict.fromkeys(_skill(m.group(1))["name"] for m in _SKILL_SCAN.finditer(all_text)))
+        parts = _parts(texts)
+        name = next((p for p in parts if not URL.fullmatch(p)), "")
+        if not name:
+            continue
+        results.append({
+            "name": name,
+            "description": " ".join(body),
+            "technologies": technologies,
+            "link": _as_url(link.group(0)) if link else "",
+            "start_date": start,
+            "end_date": end
+        })
+    return results
+
+
+def _entries_confidence(found, entries, required):
+    if not found:
+        return 0.5
+    if not entries:
+        return 0.3
+    filled = [sum(1 for field in required if entry.get(field)) / len(required) for entry in entries]
+    return round(0.5 + 0.45 * sum(filled) / len(filled), 2)
+
+
+# Share of each field in the overall confidence
+CONFIDENCE_WEIGHTS = {"full_name": 0.15, "email": 0.15, "summary": 0.05, "education": 0.15,
+                      "experience": 0.25, "skills": 0.2, "projects": 0.05}
+
+
+def parse_resume_bytes(pdf_data):
+    """
+    Parses a PDF locally. Returns the resume dict in the Gemini parser's shape
+    with an added "confidence" mapping; overall confidence is 0 for scanned or
+    image-only documents.
+    """
+    with fitz.open(stream=pdf_data, filetype="pdf") as doc:
+        lines = extract_lines(doc)
+
+    text_chars = sum(len(line.text) for line in lines)
+    if text_chars < MIN_TEXT_CHARS:
+        return {"personal_info": {}, "summary": "", "education": [], "experience": [], "skills": [],
+                "projects": [], "confidence": {"overall": 0.0, "text_chars": text_chars}}
+
+    body_size = _body_size(lines)
+    header, sections = split_sections(lines, body_size)
+    personal_info, confidence = parse_personal_info(header, lines, body_size)
+    summary, confidence["summary"] = parse_summary(sections, header)
+    education = parse_education(sections.get("education", []))
+    experience = parse_experience(sections.get("experience", []))
+    skills, confidence["skills"] = parse_skills(sections, lines)
+    projects = parse_projects(sections.get("projects", []))
+
+    confidence["education"] = _entries_confidence("education" in sections, education, ["institution", "degree", "end_date"])
+    confidence["experience"] = _entries_confidence("experience" in sections, experience, ["company", "position", "start_date"])
+    confidence["projects"] = _entries_confidence("projects" in sections, projects, ["name", "description"])
+    confidence["overall"] = round(sum(confidence[field] * weight for field, weight in CONFIDENCE_WEIGHTS.items()), 2)
+
+    return {
+        "personal_info": personal_info,
+        "summary": summary,
+        "education": education,
+        "experience": experience,
+        "skills": skills,
+        "projects": projects,
+        "confidence": confidence
+    }
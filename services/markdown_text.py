@@ -0,0 +1,297 @@
+"""
+Markdown to plain text for LLM output, in one pass and without building HTML.
+
+Produces the same visible text as rendering with `markdown` and extracting it
+with BeautifulSoup: list items become "• item", bold/italic markers, code
+ticks, link targets and headings markers are dropped, <br> and hard breaks
+become newlines. Paragraphs are separated by a blank line and list items by a
+newline. A bold label ending in ":" in the middle of a line starts a new
+line, as it did there, so "... **Skills Advice:** ..." still begins a section.
+Emphasis may span the lines of a paragraph.
+
+MarkdownTextStream works on streamed chunks: feed() returns the text that is
+final so far, including the start of an unfinished line once its markup is
+unambiguous. Lines after an emphasis marker that is not closed yet are held
+back until it is, or until the paragraph ends.
+"""
+import re
+import html
+
+_LIST_ITEM = re.compile(r"^\s{0,3}(?:[*+-]|\d+\.)\s+(.*)$")
+_HEADING = re.compile(r"^\s{0,3}#{1,6}(?:\s+(.*?))?\s*#*\s*$")
+_RULE = re.compile(r"^\s{0,3}(?:(?:\*\s*){3,}|(?:-\s*){3,}|(?:_\s*){3,})$")
+_SETEXT = re.compile(r"^\s{0,3}(?:=+|-+)\s*$")
+_FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+_QUOTE = re.compile(r"^\s{0,3}>\s?")
+
+# Inline constructs in the order they must be tried
+_CODE = re.compile(r"`+([^`]*?)`+")
+_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_AUTOLINK = re.compile(r"<((?:https?|ftp)://[^>]+|[^@\s>]+@[^@\s>]+)>")
+_BR = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG = re.compile(r"</?[A-Za-z][^>]*>")
+_STRONG = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1", re.DOTALL)
+_EM_STAR = re.compile(r"\*(?=\S)(.+?)(?<=\S)\*", re.DOTALL)
+_EM_UNDERSCORE = re.compile(r"(?<![\w])_(?=\S)(.+?)(?<=\S)_(?![\w])", re.DOTALL)
+_OPENER = re.compile(r"\*(?=\S)|(?<![\w])_(?=\S)")
+_ESCAPE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!>])")
+
+# Characters that may still open a construct that closes later in the line
+_UNSETTLED = ("*", "`", "[", "<", "\\")
+
+
+def _inline(text, line_start=True):
+    # Escaped characters and code spans are parked so the emphasis rules skip them.
+    # line_start is False when text continues a line that already has text.
+    parked = []
+
+    def park(value):
+        parked.append(value)
+        return f"\x00{len(parked) - 1}\x00"
+
+    text = _ESCAPE.sub(lambda m: park(m.group(1)), text)
+    text = _CODE.sub(lambda m: park(m.group(1).strip()), text)
+    text = _IMAGE.sub(lambda m: m.group(1), text)
+    text = _LINK.sub(lambda m: m.group(1), text)
+    text = _AUTOLINK.sub(lambda m: m.group(1), text)
+    text = _BR.sub("\n", text)
+    text = _TAG.sub("", text)
+    text = _STRONG.sub(lambda m: _strong(m, line_start), text)
+    text = _EM_STAR.sub(lambda m: m.group(1), text)
+    text = _EM_UNDERSCORE.sub(lambda m: m.group(1), text)
+    text = html.unescape(text)
+    if parked:
+        text = re.sub(r"\x00(\d+)\x00", lambda m: parked[int(m.group(1))], text)
+    return text
+
+
+def _strong(match, line_start):
+    before = match.string[:match.start()]
+    starts_line = not before.rsplit("\n", 1)[-1].strip() and (line_start or "\n" in before)
+    if match.group(2).endswith(":") and not starts_line:
+        return "\n" + match.group(2)
+    return match.group(2)
+
+
+def _unclosed(text):
+    # True when text opens an emphasis marker that it does not close
+    text = _CODE.sub("", _ESCAPE.sub("", text))
+    text = _EM_UNDERSCORE.sub("", _EM_STAR.sub("", _STRONG.sub("", text)))
+    return _OPENER.search(text) is not None
+
+
+class MarkdownTextStream:
+    def __init__(self):
+        self._buffer = ""
+        self._in_fence = None
+        self._in_list = False
+        self._after_blank = True  # start of document counts as after a blank line
+        self._block = None  # "paragraph", "list" or None between blocks
+        self._pending = ""  # separator owed before the next emitted text
+        self._emitted_any = False
+
+        # Unfinished line: its block kind once known, and how much of it was emitted
+        self._partial_kind = None
+        self._partial_prefix = ""
+        self._partial_done = 0
+
+        # Lines held back for an open emphasis marker: (prefix, bodies, line_start)
+        self._held = None
+
+    def feed(self, chunk):
+        """Adds a chunk of markdown and returns the plain text that became final."""
+        self._buffer += chunk
+        out = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            out.append(self._finish_line(line))
+        out.append(self._advance_partial())
+        return "".join(out)
+
+    def close(self):
+        """Flushes the last line; returns the remaining text."""
+        text = self._finish_line(self._buffer) if self._buffer else ""
+        self._buffer = ""
+        return text + self._flush_held()
+
+    # ------------------ Lines ------------------
+
+    def _emit(self, text):
+        if not text:
+            return ""
+        prefix = self._pending if self._emitted_any else ""
+        self._pending = ""
+        self._emitted_any = True
+        return prefix + text
+
+    def _separate(self, separator):
+        # Keep the widest separator owed; nothing is owed before the first text
+        if self._emitted_any and len(separator) > len(self._pending):
+            self._pending = separator
+
+    def _classify(self, line):
+        """Returns (kind, prefix, body) for a complete or partial line."""
+        if self._in_fence:
+            if _FENCE.match(line) and line.strip().startswith(self._in_fence):
+                return "fence_end", "", ""
+            return "code", "", line
+        if _FENCE.match(line):
+            return "fence_start", "", ""
+        if not line.strip():
+            return "blank", "", ""
+        if self._block == "paragraph" and _SETEXT.match(line):
+            return "setext", "", ""
+        if _RULE.match(line):
+            return "rule", "", ""
+        heading = _HEADING.match(line)
+        if heading:
+            return "heading", "", heading.group(1) or ""
+        item = _LIST_ITEM.match(line)
+        if item and (self._in_list or self._after_blank):
+            return "item", "• ", item.group(1)
+        quote = _QUOTE.match(line)
+        if quote:
+            return "text", "", line[quote.end():].strip()
+        return "text", "", line.strip()
+
+    def _start_block(self, kind):
+        if kind == "item":
+            self._separate("\n" if self._in_list else "\n\n")
+            self._in_list = True
+            self._block = "list"
+        elif kind == "text":
+            if self._block is None:
+                self._separate("\n\n")
+                self._block = "paragraph"
+                self._in_list = False
+            else:
+                # Soft break inside a paragraph, or a lazy continuation of a list item
+                self._separate("\n")
+        elif kind == "heading":
+            self._separate("\n\n")
+            self._in_list = False
+            self._block = None
+
+    def _finish_line(self, line):
+        hard_break = line.endswith("  ")
+        if self._partial_kind is not None:
+            kind, prefix = self._partial_kind, self._partial_prefix
+            body = self._classify(line)[2]
+        else:
+            kind, prefix, body = self._classify(line)
+            if self._held is not None:
+                if kind == "text" and self._block is not None:
+                    return self._continue_held(body, hard_break)
+                # Any other line ends the paragraph, so the held lines go out as they are
+                flushed = self._flush_held()
+                return flushed + self._finish_line(line)
+            self._begin_line(kind)
+        done = self._partial_done
+        self._partial_kind = None
+        self._partial_prefix = ""
+        self._partial_done = 0
+
+        if kind == "fence_start":
+            self._in_fence = line.strip()[:3]
+            self._separate("\n\n")
+            self._in_list = False
+            self._block = "code"
+            return ""
+        if kind == "fence_end":
+            self._in_fence = None
+            self._block = None
+            self._after_blank = True
+            return ""
+        if kind == "code":
+            out = self._emit(body)
+            self._separate("\n")
+            return out
+        if kind == "blank":
+            self._block = None
+            self._after_blank = True
+            return ""
+        if kind in ("rule", "setext"):
+            self._block = None
+            self._in_list = False
+            self._after_blank = True
+            return ""
+
+        self._after_blank = False
+        if kind in ("item", "text") and _unclosed(body[done:]):
+            self._held = ("" if done else prefix, [body[done:]], not done)
+            return ""
+        text = _inline(body[done:], line_start=False) if done else prefix + _inline(body)
+        out = self._emit(text)
+        if kind == "heading":
+            # A heading ends its block like a blank line, so a list may follow directly
+            self._block = None
+            self._after_blank = True
+            self._separate("\n\n")
+        elif hard_break:
+            self._separate("\n")
+        return out
+
+    def _continue_held(self, body, hard_break):
+        self._after_blank = False
+        self._held[1].append(body)
+        if _unclosed("\n".join(self._held[1])):
+            return ""
+        out = self._flush_held()
+        if hard_break:
+            self._separate("\n")
+        return out
+
+    def _flush_held(self):
+        if self._held is None:
+            return ""
+        prefix, bodies, line_start = self._held
+        self._held = None
+        return self._emit(prefix + _inline("\n".join(bodies), line_start))
+
+    def _begin_line(self, kind):
+        if kind in ("item", "text", "heading"):
+            self._start_block(kind)
+
+    # ------------------ Unfinished line ------------------
+
+    def _advance_partial(self):
+        line = self._buffer
+        if self._held is not None:
+            return ""
+        if self._partial_kind is None:
+            # The block kind is only certain once the line's first word is complete
+            if not re.match(r"^\s*\S+\s", line) or self._in_fence:
+                return ""
+            kind, prefix, _ = self._classify(line)
+            if kind not in ("item", "text"):
+                return ""
+            if kind == "text" and _QUOTE.match(line):
+                return ""
+            self._begin_line(kind)
+            self._partial_kind = kind
+            self._partial_prefix = prefix
+
+        body = self._classify(line)[2] if self._partial_done == 0 else self._partial_body(line)
+        cut = body.rfind(" ")
+        if cut <= self._partial_done:
+            return ""
+        segment = body[self._partial_done:cut + 1]
+        text = _inline(segment, line_start=self._partial_done == 0)
+        if any(c in text for c in _UNSETTLED):
+            return ""
+        if self._partial_done == 0:
+            text = self._partial_prefix + text
+        self._partial_done = cut + 1
+        return self._emit(text)
+
+    def _partial_body(self, line):
+        if self._partial_kind == "item":
+            item = _LIST_ITEM.match(line)
+            return item.group(1) if item else line.strip()
+        return line.strip()
+
+
+def markdown_to_text(md_text):
+    stream = MarkdownTextStream()
+    return (stream.feed(md_text) + stream.close()).strip()
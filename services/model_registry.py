@@ -0,0 +1,140 @@
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is a high-water mark (KiB on Linux), good enough for load deltas
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+
+def parameter_bytes(model):
+    """Size of a torch model's parameters and buffers, None for anything else."""
+    if not hasattr(model, "parameters"):
+        return None
+    try:
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        total += sum(b.numel() * b.element_size() for b in model.buffers())
+        return total
+    except Exception:
+        return None
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each model exactly once.
+
+    Services register a loader under a name at import time; the model is built
+    on the first get() or on an explicit warmup(), whichever comes first.
+    Concurrent first calls block on a per-model lock instead of loading twice.
+    Load time and memory growth are recorded for every model.
+
+    Models hosted by another process (the NLP process pool) are delegated to
+    it: warmup() starts the host instead of loading them here, and status()
+    and is_ready() report the host's status.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._hosts = {}
+        self._models = {}
+        self._stats = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._stats.setdefault(name, {"status": "registered"})
+
+    def delegate(self, names, host):
+        """host provides warmup() and status() for the named models."""
+        with self._lock:
+            for name in names:
+                self._hosts[name] = host
+
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            self._stats[name] = {"status": "loading"}
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._stats[name] = {"status": "error", "error": str(e)}
+                logger.error(f"Failed to load model '{name}': {e}")
+                raise
+
+            load_seconds = time.perf_counter() - start
+            rss_after = current_rss_bytes()
+            self._stats[name] = {
+                "status": "ready",
+                "load_seconds": round(load_seconds, 3),
+                "rss_delta_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+                "parameter_bytes": parameter_bytes(model)
+            }
+            self._models[name] = model
+            logger.info(f"Loaded model '{name}' in {load_seconds:.2f}s")
+            return model
+
+    def warmup(self, names=None):
+        """Loads the given models (all registered ones by default) and returns status()."""
+        names = names or list(self._loaders)
+        # Hosts load in the background, so start them before the local models
+        hosts = []
+        for name in names:
+            host = self._hosts.get(name)
+            if host is not None and host not in hosts:
+                hosts.append(host)
+                try:
+                    host.warmup()
+                except Exception as e:
+                    logger.error(f"Failed to start the host of model '{name}': {e}")
+        for name in names:
+            if name in self._hosts:
+                continue
+            try:
+                self.get(name)
+            except Exception:
+                pass
+        return self.status()
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def is_ready(self):
+        return all(status.get("status") == "ready" for status in self.status().values())
+
+    def status(self):
+        return {
+            name: self._hosts[name].status() if name in self._hosts else dict(self._stats.get(name, {}))
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
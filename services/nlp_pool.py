@@ -0,0 +1,203 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from services.skill_gap import compute_skill_gap
+from services.model_registry import registry
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Worker side ------------------
+
+def _init_worker(torch_threads):
+    # Importing the optimizer registers the model loaders in this process
+    import torch
+    import services.resume_optimizer  # noqa: F401
+
+    registry.get("embedder")
+    registry.get("spacy")
+    # Few intra-op threads per worker: the pool already runs one process per core
+    torch.set_num_threads(torch_threads)
+
+
+def _encode_chunk(texts):
+    vectors = registry.get("embedder").encode(texts, convert_to_numpy=True, batch_size=len(texts))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _extract_chunk(texts):
+    from services.resume_optimizer import skills_from_doc
+    return [frozenset(skills_from_doc(doc)) for doc in registry.get("spacy").pipe(texts, batch_size=len(texts))]
+
+
+def _match_chunk(resume_skills, job_skill_sets, threshold):
+    return [compute_skill_gap(resume_skills, job_skills, threshold) for job_skills in job_skill_sets]
+
+
+def _embedding_dimension():
+    return registry.get("embedder").get_sentence_embedding_dimension()
+
+
+# ------------------ Web worker side ------------------
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class NLPProcessPool:
+    """
+    Process pool that hosts the embedder and spaCy model outside the web
+    worker, so CPU-bound NLP does not hold the GIL of the threads serving
+    requests. Every worker process loads both models once at start-up.
+
+    Calls are split into chunks of chunk_size that run on the workers in
+    parallel, so one large batch (optimize-batch, job index builds) can use
+    every core while small calls cost one round trip. run() hands any other
+    CPU-bound function to the same processes, so there is one pool per web
+    worker.
+
+    If a worker dies (e.g. OOM-killed) the executor is broken for good, so it
+    is replaced with a fresh one and the call is retried once.
+    """
+
+    # Loaded in the pool processes, never in the web worker
+    MODELS = ("embedder", "spacy")
+
+    def __init__(self, processes=None, chunk_size=32, torch_threads=1):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.torch_threads = torch_threads
+        self._executor = self._new_executor()
+        self._warmup = None
+        self._dimension = None
+        self._restarts = 0
+
+        self._lock = threading.Lock()
+        self._counts = {op: {"calls": 0, "items": 0, "chunks": 0} for op in ("encode", "extract_skills", "match_skills")}
+
+    def encode(self, texts):
+        """Embeddings for texts as a float32 array, in order."""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.embedding_dimension()), dtype=np.float32)
+        chunks = self._split("encode", texts)
+        return np.vstack(self._run_all(_encode_chunk, [(chunk,) for chunk in chunks]))
+
+    def extract_skills(self, texts):
+        """Skill candidates (frozensets) for each text, in order."""
+        chunks = self._split("extract_skills", list(texts))
+        results = []
+        for chunk in self._run_all(_extract_chunk, [(chunk,) for chunk in chunks]):
+            results.extend(chunk)
+        return results
+
+    def match_skills(self, resume_skills, job_skill_sets, threshold=85):
+        """SkillGap of the resume against each job's skills, in order."""
+        resume_skills = set(resume_skills)
+        chunks = self._split("match_skills", [set(s) for s in job_skill_sets])
+        results = []
+        for chunk in self._run_all(_match_chunk, [(resume_skills, chunk, threshold) for chunk in chunks]):
+            results.extend(chunk)
+        return results
+
+    def run(self, fn, *args):
+        """fn(*args) on a pool process, e.g. local PDF extraction for bulk parsing. fn must be picklable."""
+        return self._run_all(fn, [args])[0]
+
+    def embedding_dimension(self):
+        if self._dimension is None:
+            self._dimension = self._run_all(_embedding_dimension, [()])[0]
+        return self._dimension
+
+    def warmup(self):
+        """Starts the pool processes (loading the models) without waiting for them."""
+        with self._lock:
+            if self._warmup is None:
+                self._warmup = self._executor.submit(_embedding_dimension)
+            return self._warmup
+
+    def status(self):
+        """Model status as the registry reports it: registered, loading, ready or error."""
+        with self._lock:
+            warmup = self._warmup
+        if warmup is None:
+            return {"status": "registered", "host": "nlp_pool"}
+        if not warmup.done():
+            return {"status": "loading", "host": "nlp_pool"}
+        if warmup.exception() is not None:
+            return {"status": "error", "host": "nlp_pool", "error": str(warmup.exception()) or type(warmup.exception()).__name__}
+        return {"status": "ready", "host": "nlp_pool", "processes": self.processes}
+
+    def _new_executor(self):
+        # spawn, not fork: forking a process with torch and server threads running is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.torch_threads,)
+        )
+
+    def _restart(self, broken):
+        with self._lock:
+            # Concurrent callers see the same broken executor; only the first replaces it
+            if self._executor is not broken:
+                return
+            logger.warning("An NLP pool process died, starting a new pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self._warmup = None
+            self._restarts += 1
+
+    def _run_all(self, fn, calls):
+        """fn(*args) for every args in calls, in parallel; retried once on a new pool if a worker died."""
+        for attempt in range(2):
+            # After a restart this also warms the new pool, so status() recovers
+            self.warmup()
+            executor = self._executor
+            try:
+                futures = [executor.submit(fn, *args) for args in calls]
+                return [future.result() for future in futures]
+            except BrokenProcessPool:
+                self._restart(executor)
+                if attempt:
+                    raise
+
+    def _split(self, op, items):
+        chunks = _chunks(items, self.chunk_size)
+        with self._lock:
+            counts = self._counts[op]
+            counts["calls"] += 1
+            counts["items"] += len(items)
+            counts["chunks"] += len(chunks)
+        return chunks
+
+    def stats(self):
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "chunk_size": self.chunk_size,
+                "restarts": self._restarts,
+                "calls": {op: dict(counts) for op, counts in self._counts.items()}
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_nlp_pool(processes=None, chunk_size=32, torch_threads=1):
+    """The process-wide pool, created on first use; the registry reports its models from then on."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = NLPProcessPool(processes=processes, chunk_size=chunk_size, torch_threads=torch_threads)
+            registry.delegate(NLPProcessPool.MODELS, _pool)
+        return _pool
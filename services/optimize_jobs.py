@@ -0,0 +1,209 @@
+import os
+import math
+import time
+import uuid
+import socket
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from database.db import SessionLocal
+from database.models import OptimizeJob
+from services.deadline import Deadline
+from utils.timing import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Optimize queue is full")
+        self.retry_after = retry_after
+
+
+class OptimizeJobQueue:
+    """
+    Bounded worker pool for optimize requests.
+
+    submit() stores a queued OptimizeJob row and returns its id right away; a
+    worker thread runs the pipeline and writes the result (or error) back to
+    the same row, so any web worker can answer a status poll. At most
+    max_workers jobs run at once and at most max_queue more may wait; past
+    that submit() raises QueueFullError with a Retry-After estimate.
+
+    Jobs only live in the process that accepted them. Each row records its
+    owner (host, pid and a per-process boot id) and the owner refreshes
+    heartbeat_at every heartbeat_seconds while it has unfinished jobs, so
+    mark_interrupted() can tell jobs of a live sibling worker from ones whose
+    process is gone. Every run gets a Deadline of budget_ms (or the budget
+    given at submit), counted from when it starts.
+    """
+
+    def __init__(self, run_fn, max_workers=4, max_queue=32, budget_ms=None, heartbeat_seconds=15,
+                 session_factory=SessionLocal):
+        self.run_fn = run_fn
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.budget_ms = budget_ms
+        self.heartbeat_seconds = heartbeat_seconds
+        self.session_factory = session_factory
+
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._heartbeat = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="optimize")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._rejected = 0
+        self._wait_times = deque(maxlen=500)
+        self._run_times = deque(maxlen=500)
+
+    def submit(self, resume_id, resume_data, job_description, bypass_cache=False, budget_ms=None):
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(self._retry_after())
+            self._queued += 1
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="optimize-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+        try:
+            db = self.session_factory()
+            try:
+                job = OptimizeJob(resume_id=resume_id, status="queued", owner=self.owner, heartbeat_at=datetime.utcnow())
+                db.add(job)
+                db.commit()
+                job_id = job.id
+            finally:
+                db.close()
+            self._executor.submit(self._run, job_id, time.monotonic(), resume_data, job_description, bypass_cache,
+                                  budget_ms or self.budget_ms)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+        return job_id
+
+    def get(self, job_id):
+        db = self.session_factory()
+        try:
+            job = db.get(OptimizeJob, job_id)
+            if job is None:
+                return None
+            return {
+                "job_id": job.id,
+                "resume_id": job.resume_id,
+                "status": job.status,
+                "result": job.result,
+                "error": job.error,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None
+            }
+        finally:
+            db.close()
+
+    def mark_interrupted(self):
+        """
+        Marks queued or running jobs whose owner is gone as interrupted, so
+        their pollers stop waiting: jobs without a heartbeat in the last three
+        heartbeat intervals. Jobs of live workers are left alone. Returns how
+        many were marked.
+        """
+        db = self.session_factory()
+        try:
+            stale_before = datetime.utcnow() - timedelta(seconds=3 * self.heartbeat_seconds)
+            count = db.query(OptimizeJob).filter(
+                OptimizeJob.status.in_(("queued", "running")),
+                OptimizeJob.owner.is_distinct_from(self.owner),
+                (OptimizeJob.heartbeat_at == None) | (OptimizeJob.heartbeat_at < stale_before)  # noqa: E711
+            ).update({
+                "status": "interrupted",
+                "error": "The server restarted before the job finished",
+                "finished_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            if count:
+                logger.warning(f"Marked {count} unfinished optimize jobs as interrupted")
+            return count
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Could not mark interrupted optimize jobs: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(self.heartbeat_seconds)
+            db = self.session_factory()
+            try:
+                db.query(OptimizeJob).filter(
+                    OptimizeJob.owner == self.owner,
+                    OptimizeJob.status.in_(("queued", "running"))
+                ).update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Optimize job heartbeat failed: {e}")
+            finally:
+                db.close()
+
+    def stats(self):
+        with self._lock:
+            wait_ms = [w * 1000 for w in self._wait_times]
+            run_ms = [r * 1000 for r in self._run_times]
+            return {
+                "queue_depth": self._queued,
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rejected": self._rejected,
+                "wait_ms_p50": percentile(wait_ms, 50),
+                "wait_ms_p95": percentile(wait_ms, 95),
+                "run_ms_p50": percentile(run_ms, 50),
+                "run_ms_p95": percentile(run_ms, 95)
+            }
+
+    def _retry_after(self):
+        # Time for the queue ahead to drain at the recent average run time
+        average_run = sum(self._run_times) / len(self._run_times) if self._run_times else 5.0
+        return max(1, math.ceil(average_run * (self._queued + self._running) / self.max_workers))
+
+    def _run(self, job_id, enqueued_at, resume_data, job_description, bypass_cache, budget_ms):
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_times.append(started - enqueued_at)
+
+        db = self.session_factory()
+        try:
+            job = db.get(OptimizeJob, job_id)
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            job.heartbeat_at = job.started_at
+            db.commit()
+
+            try:
+                # The budget covers the run itself, not the time spent waiting in the queue
+                job.result = self.run_fn(resume_data, job_description, bypass_cache=bypass_cache,
+                                         deadline=Deadline(budget_ms))
+                job.status = "succeeded"
+            except Exception as e:
+                logger.error(f"Optimize job {job_id} failed: {e}")
+                job.error = str(e)
+                job.status = "failed"
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Could not record optimize job {job_id}: {e}")
+        finally:
+            db.close()
+            with self._lock:
+                self._running -= 1
+                self._run_times.append(time.monotonic() - started)
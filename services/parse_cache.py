@@ -0,0 +1,32 @@
+import hashlib
+
+from database.db import SessionLocal
+from database.models import ResumeParseCache as ResumeParseCacheEntry
+from services.db_cache import DatabaseTTLCache
+
+
+class ParseCache(DatabaseTTLCache):
+    """
+    Database-backed cache of parsed resumes.
+
+    Keys are a SHA-256 over the PDF bytes, the parse prompt version and the
+    requested Gemini input mode, so the same file uploaded again is answered
+    without an LLM call, changing the prompt or model invalidates every entry,
+    and a text-mode result is never returned for a pdf-mode request.
+    """
+
+    entry_model = ResumeParseCacheEntry
+    value_column = "result"
+    name = "Parse cache"
+
+    def __init__(self, ttl_seconds=30 * 24 * 3600, max_entries=2000, session_factory=SessionLocal):
+        super().__init__(ttl_seconds, max_entries, session_factory)
+
+    def make_key(self, pdf_data, prompt_version, mode):
+        digest = hashlib.sha256(pdf_data)
+        digest.update(b"\0" + prompt_version.encode("utf-8"))
+        digest.update(b"\0" + mode.encode("utf-8"))
+        return digest.hexdigest()
+
+    def set(self, key, prompt_version, result):
+        self._store(key, result, prompt_version=prompt_version)
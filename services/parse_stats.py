@@ -0,0 +1,40 @@
+import threading
+from collections import deque
+
+from utils.timing import percentile
+
+
+class ParseModeStats:
+    """Payload size and latency of recent Gemini parse calls, per input mode ("text" or "pdf")."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def record(self, mode, payload_bytes, latency_ms, ok=True):
+        with self._lock:
+            entry = self._calls.setdefault(mode, {
+                "calls": 0,
+                "failures": 0,
+                "payload_bytes": deque(maxlen=self.window),
+                "latency_ms": deque(maxlen=self.window)
+            })
+            entry["calls"] += 1
+            entry["failures"] += 0 if ok else 1
+            entry["payload_bytes"].append(payload_bytes)
+            entry["latency_ms"].append(latency_ms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                mode: {
+                    "calls": entry["calls"],
+                    "failures": entry["failures"],
+                    "mean_payload_bytes": round(sum(entry["payload_bytes"]) / len(entry["payload_bytes"])),
+                    "p50_latency_ms": round(percentile(entry["latency_ms"], 50), 1),
+                    "p95_latency_ms": round(percentile(entry["latency_ms"], 95), 1)
+                }
+                for mode, entry in self._calls.items()
+            }
+
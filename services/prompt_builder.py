@@ -0,0 +1,165 @@
+import json
+import math
+import logging
+import threading
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+# Resume sections from least to most useful to an LLM prompt; trimming starts at the front
+SECTION_PRIORITY = [
+    "publications", "volunteer_work", "extracurriculars", "courses", "achievements",
+    "certifications", "education", "projects", "experience", "skills", "summary"
+]
+
+# Bookkeeping fields that cost tokens without telling the model anything
+_DROPPED_FIELDS = {"id", "resume_id", "user_id", "created_at", "updated_at", "section_settings"}
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    # Rough for English prose and JSON; good enough for budgeting, not for billing
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _is_empty(value):
+    return value is None or value is False or (isinstance(value, (str, list, dict)) and not value)
+
+
+def _compact(value):
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if key in _DROPPED_FIELDS:
+                continue
+            item = _compact(item)
+            if not _is_empty(item):
+                out[key] = item
+        return out
+    if isinstance(value, (list, tuple)):
+        return [item for item in (_compact(v) for v in value) if not _is_empty(item)]
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m")
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def compact_resume(resume, sections=SECTION_PRIORITY):
+    """
+    The given resume sections without IDs, timestamps, section settings or
+    empty values, with dates shortened to YYYY-MM. Sections come out in
+    reading order (summary first).
+    """
+    out = {}
+    for section in reversed(sections):
+        value = _compact(resume.get(section))
+        if not _is_empty(value):
+            out[section] = value
+    return out
+
+
+def compact_json(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class Prompt:
+    def __init__(self, text, estimated_tokens, dropped_sections, trimmed_items):
+        self.text = text
+        self.estimated_tokens = estimated_tokens
+        self.dropped_sections = dropped_sections
+        self.trimmed_items = trimmed_items
+
+    def __str__(self):
+        return self.text
+
+
+class PromptBuilder:
+    """
+    Builds a prompt around a compacted resume and keeps it within
+    token_budget estimated tokens. render(data) receives the compacted
+    sections and returns the prompt text. While the prompt is over budget,
+    sections are trimmed lowest-value first: trailing list items go before
+    the whole section does, and the most valuable remaining section is never
+    dropped. A token_budget of None only measures.
+
+    Each builder keeps running token counts, see stats().
+    """
+
+    def __init__(self, name, token_budget=None, sections=SECTION_PRIORITY):
+        self.name = name
+        self.token_budget = token_budget
+        self.sections = sections
+
+        self._lock = threading.Lock()
+        self._count = 0
+        self._total_tokens = 0
+        self._max_tokens = 0
+        self._trimmed = 0
+        self._over_budget = 0
+        _BUILDERS[name] = self
+
+    def build(self, render, resume=None):
+        data = compact_resume(resume or {}, self.sections)
+        text = render(data)
+        tokens = estimate_tokens(text)
+        dropped = []
+        trimmed = 0
+
+        if self.token_budget:
+            order = [s for s in self.sections if s in data]
+            for i, section in enumerate(order):
+                if tokens <= self.token_budget:
+                    break
+                items = data[section]
+                while isinstance(items, list) and len(items) > 1 and tokens > self.token_budget:
+                    items.pop()
+                    trimmed += 1
+                    text = render(data)
+                    tokens = estimate_tokens(text)
+                if tokens > self.token_budget and i < len(order) - 1:
+                    del data[section]
+                    dropped.append(section)
+                    text = render(data)
+                    tokens = estimate_tokens(text)
+            if tokens > self.token_budget:
+                logger.warning(f"{self.name} prompt is {tokens} tokens after trimming, budget {self.token_budget}")
+
+        self._record(tokens, bool(dropped or trimmed), self.token_budget is not None and tokens > self.token_budget)
+        if dropped or trimmed:
+            logger.info(f"{self.name} prompt trimmed to {tokens} tokens: dropped {dropped}, {trimmed} items")
+        return Prompt(text, tokens, dropped, trimmed)
+
+    def measure(self, text):
+        """Records a prompt that was built elsewhere; returns its estimated tokens."""
+        tokens = estimate_tokens(text)
+        self._record(tokens, False, self.token_budget is not None and tokens > self.token_budget)
+        return tokens
+
+    def _record(self, tokens, trimmed, over_budget):
+        with self._lock:
+            self._count += 1
+            self._total_tokens += tokens
+            self._max_tokens = max(self._max_tokens, tokens)
+            self._trimmed += int(trimmed)
+            self._over_budget += int(over_budget)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "token_budget": self.token_budget,
+                "prompts": self._count,
+                "mean_tokens": round(self._total_tokens / self._count, 1) if self._count else None,
+                "max_tokens": self._max_tokens,
+                "trimmed": self._trimmed,
+                "over_budget": self._over_budget
+            }
+
+
+_BUILDERS = {}
+
+
+def prompt_stats():
+    """Estimated prompt sizes per builder in this process."""
+    return {name: builder.stats() for name, builder in _BUILDERS.items()}
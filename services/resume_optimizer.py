@@ -1,18 +1,36 @@
 import os
-import json
 import re
-from datetime import datetime, date
-
+import hashlib
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import numpy as np
 import spacy
 import torch
-from sentence_transformers import SentenceTransformer, util
-from rapidfuzz import fuzz  # Replaces fuzzywuzzy
 
 from google import genai
 from google.genai import types
 
-from markdown import markdown
-from bs4 import BeautifulSoup
+from config import Config
+from services.embedding_cache import EmbeddingCache
+from services.skill_normalizer import SkillNormalizer
+from services.skill_gap import compute_skill_gap
+from services.llm_cache import LLMResponseCache
+from services.model_registry import registry
+from services.embedding_backends import EMBEDDING_MODEL_NAME, build_embedder, cache_namespace
+from services.nlp_pool import get_nlp_pool
+from services.section_embeddings import SectionEmbeddingStore
+from services.ats_rules import resume_ats_issues, ats_result
+from services.markdown_text import markdown_to_text, MarkdownTextStream
+from services.prompt_builder import PromptBuilder, compact_json
+from services.deadline import Deadline, DeadlineExceeded
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.timing import timed, submit_with_context
+
+logger = logging.getLogger(__name__)
 
 
 STANDARD_SKILLS = {
@@ -41,102 +59,440 @@ STANDARD_SKILLS = {
     "pandas": "pandas", "numpy": "numpy", "matplotlib": "matplotlib", "seaborn": "seaborn"
 }
 
+# Built once per process; keeps an LRU of tokens it has already resolved
+SKILL_NORMALIZER = SkillNormalizer(STANDARD_SKILLS, threshold=85)
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# Shared by all optimizer instances so independent Gemini calls of one request run side by side
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=Config.LLM_MAX_WORKERS, thread_name_prefix="llm")
+
+# Advice prompts carry a compacted resume trimmed to this many estimated tokens
+ADVICE_PROMPT = PromptBuilder("advice", token_budget=Config.ADVICE_PROMPT_MAX_TOKENS)
+
+# Process-wide, so once Gemini keeps failing no request waits on it until it recovers
+GEMINI_BREAKER = CircuitBreaker(
+    "gemini",
+    failure_threshold=Config.LLM_BREAKER_FAILURES,
+    reset_seconds=Config.LLM_BREAKER_RESET_SECONDS
+)
+
+# Skill extraction only reads POS tags (tagger + attribute_ruler) and stop-word flags
+SPACY_EXCLUDED_COMPONENTS = ["parser", "ner", "lemmatizer"]
+
+
+def load_spacy_model(model=None):
+    """
+    Loads the spaCy model with the unused components excluded. `model` is a
+    package name or a path to a model directory. Nothing is downloaded unless
+    SPACY_AUTO_DOWNLOAD is enabled, so offline deployments fail fast with a
+    clear message instead of shelling out to pip.
+    """
+    model = model or Config.SPACY_MODEL
+    try:
+        return spacy.load(model, exclude=SPACY_EXCLUDED_COMPONENTS)
+    except OSError:
+        if not Config.SPACY_AUTO_DOWNLOAD:
+            raise RuntimeError(
+                f"spaCy model '{model}' is not available. Install it with "
+                f"'python -m spacy download {model}', set SPACY_MODEL to a model directory, "
+                "or set SPACY_AUTO_DOWNLOAD=true."
+            )
+
+    from spacy.cli import download
+    download(model)
+    return spacy.load(model, exclude=SPACY_EXCLUDED_COMPONENTS)
+
+
+# Loaded once per process, on first use or on registry.warmup()
+registry.register("embedder", lambda: build_embedder(
+    backend=Config.EMBEDDING_BACKEND,
+    model_name=EMBEDDING_MODEL_NAME,
+    device=Config.DEVICE,
+    num_threads=Config.TORCH_NUM_THREADS
+))
+registry.register("spacy", load_spacy_model)
+
+
+def skills_from_doc(doc):
+    return set(token.text.lower() for token in doc if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop and len(token.text) > 2)
+
 
 class ResumeOptimizer:
-    def __init__(self):
-        self.client = genai.Client()
-        self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, client=None):
+        # client: any object with the genai.Client models API; benchmarks pass a fake one
+        self.client = client or genai.Client(
+            http_options=types.HttpOptions(timeout=int(Config.LLM_TIMEOUT_SECONDS * 1000))
+        )
+        self.llm_cache = LLMResponseCache(
+            ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
+            max_entries=Config.LLM_CACHE_MAX_ENTRIES
+        ) if Config.LLM_CACHE_ENABLED else None
+        self.skill_normalizer = SKILL_NORMALIZER
+        self.embedding_namespace = cache_namespace(EMBEDDING_MODEL_NAME, Config.EMBEDDING_BACKEND)
+        self.section_store = SectionEmbeddingStore()
+        self.embedding_cache = EmbeddingCache(
+            self.embedding_namespace,
+            cache_dir=Config.EMBEDDING_CACHE_DIR,
+            max_memory_items=Config.EMBEDDING_CACHE_MEMORY_ITEMS,
+            shard_size=Config.EMBEDDING_CACHE_SHARD_SIZE,
+            max_shards=Config.EMBEDDING_CACHE_MAX_SHARDS
+        )
 
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+        self._skill_cache = OrderedDict()
+        self._skill_cache_lock = threading.Lock()
 
+        # With the pool enabled the models are only loaded in the pool processes
+        self.nlp_pool = get_nlp_pool(
+            processes=Config.NLP_POOL_PROCESSES or None,
+            chunk_size=Config.NLP_POOL_CHUNK_SIZE,
+            torch_threads=Config.NLP_POOL_TORCH_THREADS
+        ) if Config.NLP_POOL_ENABLED else None
 
-    
-# Controlled vocabulary: maps variants to canonical skill names
-    
+    # Models come from the shared registry, so constructing an optimizer is cheap
+    @property
+    def embedder(self):
+        return registry.get("embedder")
+
+    @property
+    def nlp(self):
+        return registry.get("spacy")
 
     def standardize_skill(self,skill: str) -> str:
-        norm = skill.lower().strip()
-        best_match = norm
-        best_score = 0
-        for variant, canonical in STANDARD_SKILLS.items():
-            score = fuzz.ratio(variant, norm)
-            if score > best_score and score > 85:
-                best_score = score
-                best_match = canonical
-        return best_match
-
-    def optimize_for_job(self, resume, job_description):
-        resume_text = self._get_resume_text(resume)
+        return self.skill_normalizer.standardize(skill)
+
+    @timed("fuzzy_match")
+    def standardize_skills(self, skills):
+        return self.skill_normalizer.standardize_skills(list(skills))
+
+    def optimize_for_job(self, resume, job_description, deadline=None):
+        return self.run_optimization(resume, job_description, with_advice=False, deadline=deadline)["optimization"]
+
+    def run_optimization(self, resume, job_description, with_advice=True, bypass_cache=False, deadline=None):
+        """
+        Runs the optimize pipeline and, optionally, the improvement advice.
+
+        The Gemini calls only depend on the skill gap, so they are submitted to
+        the shared LLM pool as soon as it is known; the embedding similarity is
+        computed while they are in flight. bypass_cache forces fresh Gemini
+        responses.
+
+        deadline (a Deadline) bounds how long the Gemini results are waited
+        for, and each Gemini call times out when it runs out. Fields that miss
+        it, or whose call fails, come back as None and are listed in
+        "degraded" with the reason; the local score, feedback and skill gap
+        are always returned.
+        """
+        deadline = deadline or Deadline()
+        skill_gap = self._analyze_skills(resume, job_description)
+        missing_skills = skill_gap.missing
 
-        resume_embedding = self.embedder.encode(resume_text, convert_to_tensor=True)
-        job_embedding = self.embedder.encode(job_description, convert_to_tensor=True)
-        similarity_score = util.pytorch_cos_sim(resume_embedding, job_embedding).item()
+        boost_future = self._submit_llm(deadline, self._generate_resume_boost_paragraph, missing_skills, job_description, bypass_cache, deadline)
+        advice_future = None
+        if with_advice:
+            ats_result = self.check_ats_compatibility(resume)
+            keyword_matches = {skill: 0.0 for skill in missing_skills}
+            advice_future = self._submit_llm(deadline, self.enhance_resume, resume, ats_result, keyword_matches, bypass_cache, deadline)
 
-        resume_skills = set(self.standardize_skill(s) for s in self._extract_skills_with_nlp(resume_text))
-        job_skills = set(self.standardize_skill(s) for s in self._extract_skills_with_nlp(job_description))
-        missing_skills = self._find_missing_skills(resume_skills, job_skills)
+        # Local work below overlaps with the Gemini round trips
+        similarity_score, section_scores = self._score_similarity(resume, job_description)
 
         suggestions = self._generate_suggestions(resume, missing_skills)
         optimized_summary = self._optimize_summary(resume, job_description)
 
-        return {
+        degraded = {}
+        optimization = {
             "score": similarity_score,
             "feedback": self._get_feedback_category(similarity_score),
             "suggestions": suggestions,
             "optimized_summary": optimized_summary,
             "missing_skills": missing_skills,
-            "resume_boost_paragraph": self._generate_resume_boost_paragraph(missing_skills, job_description)
+            "skill_matches": skill_gap.matches,
+            "section_scores": section_scores,
+            "resume_boost_paragraph": self._await_llm(boost_future, deadline, "resume_boost_paragraph", degraded)
         }
+        improvement_advice = None
+        if with_advice:
+            improvement_advice = self._await_llm(advice_future, deadline, "improvement_advice", degraded)
 
-    def enhance_resume(self, resume, ats_result, keyword_matches):
-        ats_issues = "\n".join(f"- {i}" for i in ats_result['issues']) or "None"
-        missing = [k for k, v in keyword_matches.items() if v < 0.5]
-        missing_text = ", ".join(missing[:10]) or "None"
+        return {
+            "optimization": optimization,
+            "improvement_advice": improvement_advice,
+            "degraded": degraded
+        }
+
+    def stream_optimization(self, resume, job_description, bypass_cache=False, deadline=None):
+        """
+        Streaming variant of run_optimization. Yields (event, data) pairs as
+        soon as each stage finishes: "skills" and "score" from the local
+        stages, then Gemini output as "boost_delta"/"advice_delta" chunks while
+        it is generated, "boost" and "advice" with the final values, and
+        "done". A failed Gemini call, or one still running when the deadline
+        passes, yields "error" for that stage only, marked "degraded".
+        """
+        deadline = deadline or Deadline()
+        skill_gap = self._analyze_skills(resume, job_description)
+        missing_skills = skill_gap.missing
+
+        # Both Gemini streams start right away and feed one queue
+        events = queue.Queue()
+        ats_result = self.check_ats_compatibility(resume)
+        keyword_matches = {skill: 0.0 for skill in missing_skills}
+        prompts = {
+            "boost": self._build_boost_prompt(missing_skills, job_description),
+            "advice": self._build_enhance_prompt(resume, ats_result, keyword_matches)
+        }
+        for stage, prompt in prompts.items():
+            if prompt is None:
+                events.put((stage, "final", "Your resume already highlights the key skills!"))
+            else:
+                LLM_EXECUTOR.submit(self._pump_gemini_stream, stage, prompt, events, bypass_cache, deadline)
 
-        prompt = self._build_advice_prompt(resume, ats_issues, missing_text)
-        response = self._generate_with_gemini(prompt)
+        yield "skills", {
+            "missing_skills": missing_skills,
+            "skill_matches": skill_gap.matches,
+            "suggestions": self._generate_suggestions(resume, missing_skills),
+            "optimized_summary": self._optimize_summary(resume, job_description)
+        }
+
+        similarity_score, section_scores = self._score_similarity(resume, job_description)
+        yield "score", {
+            "score": similarity_score,
+            "feedback": self._get_feedback_category(similarity_score),
+            "section_scores": section_scores
+        }
+
+        pending = set(prompts)
+        while pending:
+            try:
+                stage, kind, text = events.get(timeout=deadline.remaining())
+            except queue.Empty:
+                for stage in sorted(pending):
+                    yield "error", {"stage": stage, "error": "timeout", "degraded": True}
+                break
+            if kind == "delta":
+                yield f"{stage}_delta", {"text": text}
+                continue
+            pending.discard(stage)
+            if kind == "error":
+                yield "error", {"stage": stage, "error": text, "degraded": True}
+            elif stage == "boost":
+                yield "boost", {"resume_boost_paragraph": text.strip()}
+            else:
+                yield "advice", {"improvement_advice": self._extract_advice_from_response(text)}
+
+        yield "done", {}
+
+    def optimize_batch(self, resume, job_descriptions, top_k=None):
+        """
+        Scores one resume against many job descriptions. The resume sections are
+        encoded once, every job description is encoded in a single batched call
+        and the similarities come out of one matrix op.
+
+        Returns a list of results ranked by score; "index" points back into
+        job_descriptions.
+        """
+        job_descriptions = list(job_descriptions)
+        if not job_descriptions:
+            return []
+
+        resume_text = self._get_resume_text(resume)
+
+        sections, section_vectors, pooled = self._embed_resume_sections(resume)
+        job_embeddings = self._normalize(self._encode(job_descriptions))
+        scores = (job_embeddings @ pooled).tolist()
+        section_scores = (job_embeddings @ section_vectors.T).tolist()
+
+        skill_sets = self._extract_skill_sets([resume_text] + job_descriptions)
+        resume_skills = set(self.standardize_skills(skill_sets[0]))
+        job_skill_sets = [set(self.standardize_skills(raw)) for raw in skill_sets[1:]]
+        if self.nlp_pool:
+            with timed("fuzzy_match"):
+                gaps = self.nlp_pool.match_skills(resume_skills, job_skill_sets)
+        else:
+            gaps = [self._find_missing_skills(resume_skills, job_skills) for job_skills in job_skill_sets]
+
+        results = []
+        for index, (gap, score) in enumerate(zip(gaps, scores)):
+            results.append({
+                "index": index,
+                "score": score,
+                "feedback": self._get_feedback_category(score),
+                "missing_skills": gap.missing,
+                "section_scores": dict(zip(sections, section_scores[index]))
+            })
+
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:top_k] if top_k else results
+
+    def embed_texts(self, texts):
+        # Unit vectors for arbitrary texts, through the embedding cache
+        return self._normalize(self._encode(list(texts)))
+
+    def embed_resume(self, resume):
+        # Pooled unit vector of the resume sections
+        return self._embed_resume_sections(resume)[2]
+
+    def enhance_resume(self, resume, ats_result, keyword_matches, bypass_cache=False, deadline=None):
+        prompt = self._build_enhance_prompt(resume, ats_result, keyword_matches)
+        response = self._generate_with_gemini(prompt, bypass_cache=bypass_cache, deadline=deadline)
 
         return self._extract_advice_from_response(response)
 
     def check_ats_compatibility(self, resume):
-        issues = self._check_ats_compatibility(resume)
-        return {
-            "is_compatible": len(issues) == 0,
-            "issues": issues,
-            "compatibility_score": 1.0 - (len(issues) * 0.1)
-        }
+        return ats_result(self._check_ats_compatibility(resume))
 
     # ------------------ Internal Methods ------------------
 
+    def _submit_llm(self, deadline, fn, *args):
+        # No point starting a Gemini call the request can no longer wait for
+        if self._llm_timeout(deadline) is None:
+            return None
+        return submit_with_context(LLM_EXECUTOR, fn, *args)
+
+    def _await_llm(self, future, deadline, field, degraded):
+        if future is None:
+            degraded[field] = "timeout"
+            return None
+        try:
+            return future.result(timeout=deadline.remaining())
+        except (FutureTimeoutError, DeadlineExceeded):
+            degraded[field] = "timeout"
+        except CircuitOpenError:
+            degraded[field] = "circuit_open"
+        except Exception as e:
+            logger.warning(f"Gemini call for {field} failed: {e}")
+            degraded[field] = "error"
+        return None
+
+    def _analyze_skills(self, resume, job_description):
+        resume_text = self._get_resume_text(resume)
+        resume_raw_skills, job_raw_skills = self._extract_skill_sets([resume_text, job_description])
+        resume_skills = set(self.standardize_skills(resume_raw_skills))
+        job_skills = set(self.standardize_skills(job_raw_skills))
+        return self._find_missing_skills(resume_skills, job_skills)
+
+    def _score_similarity(self, resume, job_description):
+        sections, section_vectors, pooled = self._embed_resume_sections(resume)
+        job_embedding = self._normalize(self._encode([job_description]))[0]
+        similarity_score = float(pooled @ job_embedding)
+        section_scores = dict(zip(sections, (section_vectors @ job_embedding).tolist()))
+        return similarity_score, section_scores
+
     def _get_resume_text(self, resume):
-        sections = []
-        sections.append(resume.get("summary", ""))
-        for exp in resume.get("experience", []):
-            sections.append(exp.get("description", ""))
-            sections.extend(exp.get("achievements", []))
-        skills = [s["name"] for s in resume.get("skills", [])]
-        sections.append(" ".join(skills))
-        for project in resume.get("projects", []):
-            sections.append(project.get("description", ""))
-            sections.append(" ".join(project.get("technologies", [])))
-        return " ".join(sections)
+        return " ".join(part for parts in self._get_section_parts(resume).values() for part in parts)
+
+    def _get_section_parts(self, resume):
+        sections = OrderedDict()
+        sections["summary"] = [resume.get("summary") or ""]
+        sections["experience"] = []
+        for exp in resume.get("experience") or []:
+            sections["experience"].append(exp.get("description") or "")
+            sections["experience"].extend(exp.get("achievements") or [])
+        sections["skills"] = [" ".join(s["name"] for s in resume.get("skills") or [])]
+        sections["projects"] = []
+        for project in resume.get("projects") or []:
+            sections["projects"].append(project.get("description") or "")
+            sections["projects"].append(" ".join(project.get("technologies") or []))
+        return sections
+
+    def _embed_resume_sections(self, resume):
+        """
+        Returns (section names, unit section vectors, pooled unit vector).
 
-    def _extract_skills_with_nlp(self, text):
-        doc = self.nlp(text)
-        return set(token.text.lower() for token in doc if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop and len(token.text) > 2)
+        Section vectors are stored per resume with the hash of their text, so
+        only sections edited since the last call are encoded again. The pooled
+        vector is the word-count weighted mean of the section vectors.
+        """
+        texts = OrderedDict()
+        for name, parts in self._get_section_parts(resume).items():
+            text = " ".join(parts)
+            if text.strip():
+                texts[name] = text
+        if not texts:
+            dim = self.nlp_pool.embedding_dimension() if self.nlp_pool else self.embedder.get_sentence_embedding_dimension()
+            return [], np.zeros((0, dim), dtype=np.float32), np.zeros(dim, dtype=np.float32)
+
+        hashes = {name: hashlib.sha256(text.encode("utf-8")).hexdigest() for name, text in texts.items()}
+        resume_id = resume.get("id")
+        stored = self.section_store.load(resume_id, self.embedding_namespace) if resume_id else {}
+
+        vectors = {name: stored[name][1] for name in texts if name in stored and stored[name][0] == hashes[name]}
+        changed = [name for name in texts if name not in vectors]
+        updates = {}
+        if changed:
+            encoded = self._encode([texts[name] for name in changed])
+            for name, vector in zip(changed, encoded):
+                vectors[name] = vector
+                updates[name] = (hashes[name], vector)
+        removed = [name for name in stored if name not in texts]
+        if resume_id and (updates or removed):
+            self.section_store.save(resume_id, self.embedding_namespace, updates, removed)
+
+        sections = list(texts)
+        section_vectors = self._normalize(np.vstack([vectors[name] for name in sections]))
+        weights = np.array([len(texts[name].split()) for name in sections], dtype=np.float32)
+        pooled = self._normalize((weights[:, None] * section_vectors).sum(axis=0, keepdims=True))[0]
+        return sections, section_vectors, pooled
+
+    def _normalize(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+    @timed("embedding")
+    def _encode(self, texts):
+        # Unchanged texts are served from the embedding cache, the rest are encoded in one batch
+        if self.nlp_pool:
+            return self.embedding_cache.encode(texts, self.nlp_pool.encode)
+        return self.embedding_cache.encode(
+            texts,
+            lambda missing: self.embedder.encode(missing, convert_to_numpy=True, batch_size=32)
+        )
 
+    def _extract_skills_with_nlp(self, text):
+        return self._extract_skill_sets([text])[0]
+
+    @timed("spacy")
+    def _extract_skill_sets(self, texts):
+        # Texts seen before are served from the cache; the rest go through nlp.pipe in one pass
+        keys = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in texts]
+        results = [None] * len(texts)
+        pending = {}
+        with self._skill_cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._skill_cache.get(key)
+                if cached is not None:
+                    self._skill_cache.move_to_end(key)
+                    results[i] = cached
+                else:
+                    pending.setdefault(key, []).append(i)
+
+        if pending:
+            pending_keys = list(pending)
+            pending_texts = [texts[pending[k][0]] for k in pending_keys]
+            if self.nlp_pool:
+                extracted = self.nlp_pool.extract_skills(pending_texts)
+            else:
+                docs = self.nlp.pipe(pending_texts, batch_size=Config.SPACY_BATCH_SIZE, n_process=Config.SPACY_N_PROCESS)
+                extracted = [frozenset(self._skills_from_doc(doc)) for doc in docs]
+            with self._skill_cache_lock:
+                for key, skills in zip(pending_keys, extracted):
+                    for i in pending[key]:
+                        results[i] = skills
+                    self._skill_cache[key] = skills
+                while len(self._skill_cache) > Config.SKILL_EXTRACTION_CACHE_SIZE:
+                    self._skill_cache.popitem(last=False)
+
+        return [set(r) for r in results]
+
+    def _skills_from_doc(self, doc):
+        return skills_from_doc(doc)
+
+    @timed("fuzzy_match")
     def _find_missing_skills(self, resume_skills, job_skills, threshold=85):
-        missing = []
-        for job_skill in job_skills:
-            match_found = any(fuzz.ratio(job_skill, res_skill) >= threshold for res_skill in resume_skills)
-            if not match_found:
-                missing.append(job_skill)
-        return missing
+        # Returns a SkillGap; .missing is the list of job skills without a close resume skill
+        return compute_skill_gap(resume_skills, job_skills, threshold)
 
     def _generate_suggestions(self, resume, missing_skills):
         suggestions = []
@@ -149,17 +505,7 @@ class ResumeOptimizer:
         return suggestions
 
     def _check_ats_compatibility(self, resume):
-        suggestions = []
-        if not resume.get("personal_info", {}).get("email") or not resume.get("personal_info", {}).get("phone"):
-            suggestions.append("Include phone and email in contact details.")
-        if not resume.get("education"):
-            suggestions.append("Add education section.")
-        required = ["summary", "experience", "education", "skills"]
-        visible_sections = [s["name"] for s in resume.get("section_settings", []) if s.get("visible", True)]
-        for section in required:
-            if section not in visible_sections:
-                suggestions.append(f"Ensure {section} section is visible.")
-        return suggestions
+        return resume_ats_issues(resume)
 
     def _optimize_summary(self, resume, job_description):
         if resume.get("summary"):
@@ -175,55 +521,157 @@ class ResumeOptimizer:
             return "Good match with minor improvements"
         return "Needs significant improvements"
 
-    def _generate_resume_boost_paragraph(self, missing_skills, job_description):
-        if not missing_skills:
+    def _generate_resume_boost_paragraph(self, missing_skills, job_description, bypass_cache=False, deadline=None):
+        prompt = self._build_boost_prompt(missing_skills, job_description)
+        if prompt is None:
             return "Your resume already highlights the key skills!"
+        return self._generate_with_gemini(prompt, bypass_cache=bypass_cache, deadline=deadline).strip()
+
+    def _build_boost_prompt(self, missing_skills, job_description):
+        if not missing_skills:
+            return None
         skills_list = ", ".join(missing_skills[:5])
-        prompt = (
+        return (
             f"Write a strong resume summary using these skills: {skills_list}. "
             f"{'Job Description: ' + job_description if job_description else ''} "
             "Avoid irrelevant technologies. Be concise and persuasive."
         )
-        return self._generate_with_gemini(prompt).strip()
+
+    def _build_enhance_prompt(self, resume, ats_result, keyword_matches):
+        ats_issues = "\n".join(f"- {i}" for i in ats_result['issues']) or "None"
+        missing = [k for k, v in keyword_matches.items() if v < 0.5]
+        missing_text = ", ".join(missing[:10]) or "None"
+        return self._build_advice_prompt(resume, ats_issues, missing_text)
     
-    def clean_markdown(self,md_text):
-        html = markdown(md_text)
-        soup = BeautifulSoup(html, "html.parser")
-    # Convert <ul>, <li>, <strong>, etc. into readable text
-        for li in soup.find_all("li"):
-            li.insert_before("• ")
-            li.insert_after("\n")
-        for br in soup.find_all("br"):
-            br.replace_with("\n")
-        for strong in soup.find_all("strong"):
-            strong.string = f"{strong.get_text(strip=True)}"
-
-        cleaned = soup.get_text(separator="\n").strip()
-        return cleaned
+    def clean_markdown(self, md_text):
+        # Bullets become "• ", emphasis markers and link targets are dropped
+        return markdown_to_text(md_text)
         
         
     
-    def _generate_with_gemini(self, prompt):
-        cfg = types.GenerateContentConfig(
+    def _gemini_config(self):
+        return types.GenerateContentConfig(
             thinking_config=types.ThinkingConfig(thinking_budget=0),
             temperature=0.7,
             max_output_tokens=350,
             top_p=0.9,
             top_k=40
         )
-        response = self.client.models.generate_content(model="gemini-2.5-flash", contents=prompt, config=cfg)
+
+    def _llm_timeout(self, deadline):
+        """
+        Seconds one Gemini call may take: LLM_TIMEOUT_SECONDS capped by what is
+        left of the deadline. None when less than LLM_MIN_BUDGET_MS is left,
+        since a call that short would only hold an LLM thread and fail.
+        """
+        timeout = (deadline or Deadline()).cap(Config.LLM_TIMEOUT_SECONDS)
+        if timeout * 1000 < Config.LLM_MIN_BUDGET_MS:
+            return None
+        return timeout
+
+    def _request_config(self, cfg, deadline):
+        # The cache key is built from cfg without the per-call timeout
+        timeout = self._llm_timeout(deadline)
+        if timeout is None:
+            raise DeadlineExceeded("Not enough of the request budget left for a Gemini call")
+        return cfg.model_copy(update={"http_options": types.HttpOptions(timeout=int(timeout * 1000))})
+
+    def _stream_with_gemini(self, prompt, bypass_cache=False, deadline=None):
+        """
+        Streaming counterpart of _generate_with_gemini. Yields ("delta", text)
+        with the plain text converted so far from each chunk and finally
+        ("final", cleaned_text). Cache hits are yielded as a single delta.
+        """
+        model = GEMINI_MODEL
+        cfg = self._gemini_config()
+
+        cache_key = None
+        if self.llm_cache is not None:
+            cache_key = self.llm_cache.make_key(model, cfg, prompt)
+            if not bypass_cache:
+                cached = self.llm_cache.get(cache_key)
+                if cached is not None:
+                    yield "delta", cached
+                    yield "final", cached
+                    return
+
+        request_cfg = self._request_config(cfg, deadline)
+        if not GEMINI_BREAKER.allow():
+            raise CircuitOpenError("Gemini circuit is open")
+        converter = MarkdownTextStream()
+        parts = []
+        completed = False
+        try:
+            for chunk in self.client.models.generate_content_stream(model=model, contents=prompt, config=request_cfg):
+                text = converter.feed(chunk.text) if chunk.text else ""
+                if text:
+                    parts.append(text)
+                    yield "delta", text
+            completed = True
+        finally:
+            # An abandoned stream also ends a half-open trial, so it is counted as a failure
+            if completed:
+                GEMINI_BREAKER.record_success()
+            else:
+                GEMINI_BREAKER.record_failure()
+
+        tail = converter.close()
+        if tail:
+            parts.append(tail)
+            yield "delta", tail
+        cleaned_output = "".join(parts).strip()
+        if cache_key is not None:
+            self.llm_cache.set(cache_key, model, cleaned_output)
+        yield "final", cleaned_output
+
+    def _pump_gemini_stream(self, stage, prompt, events, bypass_cache=False, deadline=None):
+        # Runs on the LLM pool and forwards one Gemini stream into the shared queue
+        try:
+            for kind, text in self._stream_with_gemini(prompt, bypass_cache, deadline):
+                events.put((stage, kind, text))
+        except DeadlineExceeded:
+            events.put((stage, "error", "timeout"))
+        except Exception as e:
+            events.put((stage, "error", str(e)))
+
+    @timed("llm")
+    def _generate_with_gemini(self, prompt, bypass_cache=False, deadline=None):
+        # bypass_cache skips the lookup; the fresh response still replaces the cached one.
+        # The call times out with the deadline, so it never outlives its request
+        model = GEMINI_MODEL
+        cfg = self._gemini_config()
+
+        cache_key = None
+        if self.llm_cache is not None:
+            cache_key = self.llm_cache.make_key(model, cfg, prompt)
+            if not bypass_cache:
+                cached = self.llm_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+        # Cache hits above still work while the circuit is open or the budget is nearly spent
+        request_cfg = self._request_config(cfg, deadline)
+        if not GEMINI_BREAKER.allow():
+            raise CircuitOpenError("Gemini circuit is open")
+        try:
+            response = self.client.models.generate_content(model=model, contents=prompt, config=request_cfg)
+        except Exception:
+            GEMINI_BREAKER.record_failure()
+            raise
+        GEMINI_BREAKER.record_success()
         raw_output = response.text
         cleaned_output = self.clean_markdown(raw_output)
+
+        if cache_key is not None:
+            self.llm_cache.set(cache_key, model, cleaned_output)
         return cleaned_output
     
     def _build_advice_prompt(self, resume, ats_issues, missing_keywords):
-        def custom_serializer(obj):
-            if isinstance(obj, (date, datetime)):
-                return obj.isoformat()
-            raise TypeError(f"Type {type(obj)} not serializable")
-
-        resume_json = json.dumps(resume, indent=2, default=custom_serializer)
+        # Compact JSON without IDs, timestamps or empty fields; low-value sections are trimmed to the budget
+        prompt = ADVICE_PROMPT.build(lambda data: self._render_advice_prompt(compact_json(data), ats_issues, missing_keywords), resume)
+        return prompt.text
 
+    def _render_advice_prompt(self, resume_json, ats_issues, missing_keywords):
         return f"""
 You are an expert resume coach AI. Analyze the candidate's resume and provide specific, actionable feedback based on ATS optimization principles.
 
@@ -1,57 +1,28 @@
 import os
-import re
-import fitz  # PyMuPDF, you may need to run: pip install PyMuPDF
 import base64
 from dotenv import load_dotenv  # you may need to run: pip install python-dotenv
 from google import genai
 from google.genai import types
 import uuid
 import json
-from io import BytesIO
+import time
+import hashlib
+import threading
+
+from config import Config
+from services.model_registry import registry
+from services.parse_cache import ParseCache
+from services.local_resume_parser import parse_resume_bytes, layout_text
+from services.parse_stats import ParseModeStats
+from services.prompt_builder import PromptBuilder
 
 # Load environment variables from a .env file
 load_dotenv()
 
-class ResumeParser:
-    """
-    A class to parse resume files (PDF) using the Gemini API with a fallback
-    to local text extraction, outputting in a detailed, structured JSON format.
-    """
-    def __init__(self):
-        """Initializes the parser and creates the Gemini client."""
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if not self.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables. Please set it in your .env file.")
-        
-        # Initialize the Gemini client using the modern API pattern
-        self.client = genai.Client()
-
-    def parse_from_pdf(self, pdf_file):
-        """
-        Parses a PDF resume, first by attempting to use the Gemini API,
-        and then falling back to a local text extraction method if the API call fails.
-
-        Args:
-            pdf_file (str or file-like object): The path to the PDF file or a file-like object.
-
-        Returns:
-            dict: A dictionary containing the parsed resume data.
-        """
-        pdf_data = None
-
-        # --- Step 1: Try parsing with Gemini API ---
-        try:
-            print("Attempting to parse with the Gemini API...")
-            if isinstance(pdf_file, str):
-                with open(pdf_file, "rb") as f:
-                    pdf_data = f.read()
-            else:
-                pdf_file.seek(0)
-                pdf_data = pdf_file.read()
+PARSE_MODEL = "gemini-1.5-flash"
 
-            # --- MODIFIED PROMPT ---
-            # The instructions now strongly enforce the YYYY-MM-DD date format.
-            prompt = """You are an expert resume parser. Your task is to analyze the provided resume document and extract its content into a single, structured JSON object that conforms to the detailed format below.
+# The instructions strongly enforce the YYYY-MM-DD date format.
+PARSE_PROMPT_TEXT = """You are an expert resume parser. Your task is to analyze the provided resume document and extract its content into a single, structured JSON object that conforms to the detailed format below.
 
 Instructions:
 1. Parse the entire resume document for all sections.
@@ -118,111 +89,207 @@ JSON Output Format:
 }
 """
 
-            # Convert PDF to base64 for proper file upload
-            pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
-
-            # Create proper content structure using types
-            contents = [
-                types.Part(text=prompt),
-                types.Part(inline_data=types.Blob(
-                    mime_type="application/pdf",
-                    data=pdf_base64
-                ))
-            ]
-
-            # Configure generation settings
-            cfg = types.GenerateContentConfig(
-                temperature=0.3,
-                max_output_tokens=4000,
-                top_p=0.9,
-                top_k=40
-            )
-
-            # Use the modern Gemini API pattern
-            response = self.client.models.generate_content(
-                model="gemini-1.5-flash", 
-                contents=contents, 
-                config=cfg
-            )
-            
-            raw_response_text = response.text
-            json_start = raw_response_text.find('{')
-            json_end = raw_response_text.rfind('}') + 1
-            if json_start != -1 and json_end != -1:
-                clean_json_text = raw_response_text[json_start:json_end]
-                print("Successfully parsed with Gemini API.")
-                return json.loads(clean_json_text)
-            else:
-                raise Exception("Could not find a valid JSON object in the Gemini response.")
+# Part of the parse cache key: editing the prompt or switching models invalidates cached results
+PARSE_PROMPT_VERSION = hashlib.sha256(f"{PARSE_MODEL}\n{PARSE_PROMPT_TEXT}".encode("utf-8")).hexdigest()[:16]
 
-        except Exception as e:
-            print(f"Gemini parsing failed: {e}")
-            print("Attempting fallback parsing...")
+# Introduces the extracted text in text mode; the instructions above stay the same
+TEXT_MODE_PREAMBLE = "The resume document is given below as plain text in reading order; lines starting with '## ' are section headings.\n\nResume text:"
+
+# The parse prompt is fixed text plus the PDF, so it is only measured, not trimmed
+PARSE_PROMPT = PromptBuilder("parse")
+
+PARSE_MODE_STATS = ParseModeStats()
+
+# Caps concurrent Gemini parse calls across all threads (bulk ingestion included)
+GEMINI_PARSE_SLOTS = threading.BoundedSemaphore(Config.PARSE_GEMINI_CONCURRENCY)
+
+PARSE_CACHE = ParseCache(
+    ttl_seconds=Config.PARSE_CACHE_TTL_SECONDS,
+    max_entries=Config.PARSE_CACHE_MAX_ENTRIES
+) if Config.PARSE_CACHE_ENABLED else None
+
+class ResumeParser:
+    """
+    A class to parse resume files (PDF) with the local layout parser, escalating
+    to the Gemini API when the local result is not confident enough, and
+    outputting in a detailed, structured JSON format.
+    """
+    def __init__(self):
+        """
+        Initializes the parser. The Gemini client is only created when a resume
+        first needs escalating, so local parsing works without GEMINI_API_KEY.
+        """
+        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
+        self._client = None
+        self._client_lock = threading.Lock()
 
-        # --- Step 2: PyMuPDF fallback if Gemini fails ---
+    @property
+    def client(self):
+        # Without a key escalation fails like any Gemini error and the local result is used
+        if self._client is None:
+            if not self.gemini_api_key:
+                raise RuntimeError("GEMINI_API_KEY is not set, so the Gemini API is unavailable.")
+            with self._client_lock:
+                if self._client is None:
+                    # Initialize the Gemini client using the modern API pattern
+                    self._client = genai.Client(api_key=self.gemini_api_key)
+        return self._client
+
+    def parse_from_pdf(self, pdf_file):
+        """
+        Parses a PDF resume locally, calling the Gemini API only when the local
+        confidence is below LOCAL_PARSE_MIN_CONFIDENCE, and falling back to the
+        local result if the API call fails.
+
+        Args:
+            pdf_file (str or file-like object): The path to the PDF file or a file-like object.
+
+        Returns:
+            dict: A dictionary containing the parsed resume data.
+        """
+        return self.parse(pdf_file)[0]
+
+    def parse(self, pdf_file, bypass_cache=False, mode=None, local_pool=None):
+        """
+        Same as parse_from_pdf, but returns (parsed data, source, gemini call).
+        source is "cache", "local", "gemini", "fallback" or None if parsing
+        failed. Gemini results are cached by the PDF's content hash and the
+        mode; a cache hit makes no LLM call. mode picks the Gemini input: "text", "pdf" or
+        "auto" (default PARSE_GEMINI_MODE); the gemini call reports the mode
+        used, the payload size and the latency, or is None without a call.
+        local_pool (an NLPProcessPool) runs the CPU-bound local extraction
+        instead of the calling thread.
+        """
+        mode = mode or Config.PARSE_GEMINI_MODE
         try:
-            if pdf_data is None:
-                raise Exception("PDF data is not available for fallback.")
-                
-            pdf_file_obj = BytesIO(pdf_data)
-            text = self._extract_text_from_pdf(pdf_file_obj)
-            if not text or len(text.strip()) < 20:
-                raise Exception("Fallback text extraction yielded very little or no content.")
-
-            # The structure of this dictionary reflects the new detailed format.
-            parsed_data = {
-                "personal_info": self._extract_personal_info(text),
-                "summary": self._extract_summary(text),
-                "education": self._extract_education(text),
-                "experience": self._extract_experience(text),
-                "skills": self._extract_skills(text),
-                "projects": self._extract_projects(text)
-            }
-            print("Successfully parsed with fallback method.")
-            return parsed_data
+            if isinstance(pdf_file, str):
+                with open(pdf_file, "rb") as f:
+                    pdf_data = f.read()
+            else:
+                pdf_file.seek(0)
+                pdf_data = pdf_file.read()
+        except Exception as e:
+            print(f"Reading the PDF failed: {e}")
+            return {"error": "Could not read the uploaded PDF.", "details": str(e)}, None, None
+
+        # Keyed by the requested mode too, so comparing modes on one file never gets the other mode's result
+        cache_key = PARSE_CACHE.make_key(pdf_data, PARSE_PROMPT_VERSION, mode) if PARSE_CACHE is not None else None
+        if cache_key and not bypass_cache:
+            cached = PARSE_CACHE.get(cache_key)
+            if cached is not None:
+                print("Parse cache hit, skipping the Gemini API.")
+                return cached, "cache", None
 
+        parsed_data, source, call = self._parse_pdf_data(pdf_data, mode, local_pool)
+        # Fallback results are poor, so only Gemini output is worth keeping
+        if cache_key and source == "gemini":
+            PARSE_CACHE.set(cache_key, PARSE_PROMPT_VERSION, parsed_data)
+        return parsed_data, source, call
+
+    def _parse_pdf_data(self, pdf_data, mode, local_pool=None):
+        # --- Step 1: Local layout parser; Gemini is only needed when it isn't confident ---
+        local_data = None
+        try:
+            local_data = self._run_local(local_pool, parse_resume_bytes, pdf_data)
+            confidence = local_data["confidence"]["overall"]
+            if Config.LOCAL_PARSE_ENABLED and confidence >= Config.LOCAL_PARSE_MIN_CONFIDENCE:
+                print(f"Parsed locally with confidence {confidence}.")
+                return local_data, "local", None
+            print(f"Local parse confidence {confidence}, escalating to the Gemini API...")
         except Exception as e:
-            print(f"Fallback parsing also failed: {e}")
-            return {"error": "Both Gemini and fallback parsing failed.", "details": str(e)}
+            print(f"Local parsing failed: {e}")
 
-    def _extract_text_from_pdf(self, pdf_file_obj):
+        # --- Step 2: Try parsing with Gemini API ---
         try:
-            pdf_file_obj.seek(0)
-            doc = fitz.open(stream=pdf_file_obj.read(), filetype="pdf")
-            return "\n".join(page.get_text() for page in doc)
+            print("Attempting to parse with the Gemini API...")
+            parsed_data, call = self._parse_with_gemini(pdf_data, mode, local_pool)
+            return parsed_data, "gemini", call
         except Exception as e:
-            print(f"Error during PyMuPDF text extraction: {e}")
-            return ""
-
-    # --- UPDATED PLACEHOLDER METHODS FOR FALLBACK LOGIC ---
-
-    def _extract_personal_info(self, text):
-        email_match = re.search(r'[\w\.-]+@[\w\.-]+', text)
-        return {
-            "full_name": "N/A (Fallback)",
-            "email": email_match.group(0) if email_match else "",
-            "phone": "",
-            "location": "",
-            "linkedin": "",
-            "github": "",
-            "portfolio": ""
-        }
-
-    def _extract_summary(self, text):
-        return "Summary not extracted by fallback."
-
-    def _extract_education(self, text):
-        # Your logic here should find and format dates to 'YYYY-MM-DD'.
-        return []
-
-    def _extract_experience(self, text):
-        return []
-
-    def _extract_skills(self, text):
-        return []
-
-    def _extract_projects(self, text):
-        return []
+            print(f"Gemini parsing failed: {e}")
+            print("Attempting fallback parsing...")
+
+        # --- Step 3: Low-confidence local result if Gemini fails ---
+        if local_data is not None and local_data["confidence"]["overall"] > 0:
+            print("Falling back to the local parse result.")
+            return local_data, "fallback", None
+        print("Fallback parsing also failed: the PDF has too little extractable text.")
+        return {"error": "Both Gemini and fallback parsing failed.", "details": "The PDF has too little extractable text."}, None, None
+
+
+    def _run_local(self, pool, fn, pdf_data):
+        if pool is None:
+            return fn(pdf_data)
+        return pool.run(fn, pdf_data)
+
+    def _gemini_input(self, pdf_data, mode, local_pool=None):
+        """
+        Returns (mode, contents, payload bytes). Text mode sends the PDF's text
+        in reading order instead of the file, which leaves out fonts, images and
+        vector art; "auto" uses it whenever the PDF has enough text.
+        """
+        text = self._run_local(local_pool, layout_text, pdf_data) if mode in ("auto", "text") else ""
+        if mode != "pdf" and len(text) >= Config.PARSE_TEXT_MODE_MIN_CHARS:
+            prompt = f"{PARSE_PROMPT_TEXT}\n{TEXT_MODE_PREAMBLE}\n{text}"
+            print(f"Parse prompt (text mode): ~{PARSE_PROMPT.measure(prompt)} tokens")
+            return "text", [types.Part(text=prompt)], len(prompt.encode("utf-8"))
+
+        prompt = PARSE_PROMPT_TEXT
+        print(f"Parse prompt (pdf mode): ~{PARSE_PROMPT.measure(prompt)} tokens plus a {len(pdf_data)} byte PDF")
+
+        # Convert PDF to base64 for proper file upload
+        pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
+
+        # Create proper content structure using types
+        contents = [
+            types.Part(text=prompt),
+            types.Part(inline_data=types.Blob(
+                mime_type="application/pdf",
+                data=pdf_base64
+            ))
+        ]
+        return "pdf", contents, len(prompt.encode("utf-8")) + len(pdf_base64)
+
+    def _parse_with_gemini(self, pdf_data, mode, local_pool=None):
+        client = self.client
+        mode, contents, payload_bytes = self._gemini_input(pdf_data, mode, local_pool)
+
+        # Configure generation settings
+        cfg = types.GenerateContentConfig(
+            temperature=0.3,
+            max_output_tokens=4000,
+            top_p=0.9,
+            top_k=40
+        )
+
+        # Use the modern Gemini API pattern; concurrent parse calls are capped process-wide
+        with GEMINI_PARSE_SLOTS:
+            started = time.perf_counter()
+            try:
+                response = client.models.generate_content(
+                    model=PARSE_MODEL,
+                    contents=contents,
+                    config=cfg
+                )
+            except Exception:
+                PARSE_MODE_STATS.record(mode, payload_bytes, (time.perf_counter() - started) * 1000, ok=False)
+                raise
+        latency_ms = (time.perf_counter() - started) * 1000
+        PARSE_MODE_STATS.record(mode, payload_bytes, latency_ms)
+
+        raw_response_text = response.text
+        json_start = raw_response_text.find('{')
+        json_end = raw_response_text.rfind('}') + 1
+        if json_start != -1 and json_end != -1:
+            clean_json_text = raw_response_text[json_start:json_end]
+            print(f"Successfully parsed with Gemini API ({mode} mode, {payload_bytes} bytes, {latency_ms:.0f} ms).")
+            call = {"mode": mode, "payload_bytes": payload_bytes, "latency_ms": round(latency_ms, 1)}
+            return json.loads(clean_json_text), call
+        else:
+            raise Exception("Could not find a valid JSON object in the Gemini response.")
+
+
+# One parser (and Gemini client) per process, created on first use
+registry.register("resume_parser", ResumeParser)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+import re
+import uuid
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import insert
+
+from database.db import SessionLocal
+from database.models import Resume, PersonalInfo, Education, Experience, Skill, Project
+from services.local_resume_parser import to_iso_date
+
+logger = logging.getLogger(__name__)
+
+# Sections shown for a resume created from a parsed PDF, in display order
+PARSED_SECTION_SETTINGS = [
+    {"name": "personal_info", "visible": True, "order": 1},
+    {"name": "summary", "visible": True, "order": 2},
+    {"name": "education", "visible": True, "order": 3},
+    {"name": "experience", "visible": True, "order": 4},
+    {"name": "skills", "visible": True, "order": 5},
+    {"name": "projects", "visible": True, "order": 6},
+]
+
+# Insert order: parents before children
+_SECTION_MODELS = [PersonalInfo, Education, Experience, Skill, Project]
+
+
+def coerce_date(value):
+    """A date from a date, an ISO string or the looser forms parsers produce ('Sep 2018', '2018-09'); else None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    iso = to_iso_date(text)
+    return date.fromisoformat(iso) if iso else None
+
+
+def coerce_float(value):
+    """3.8, '3.8' or '3.8/4.0' as 3.8; None if there is no number."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"\d+(?:\.\d+)?", str(value))
+    return float(match.group(0)) if match else None
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [_text(v) for v in value if _text(v)]
+
+
+def resume_row(parsed_data, resume_id=None, user_id=None, title="Parsed Resume"):
+    now = datetime.utcnow()
+    return {
+        "id": resume_id or str(uuid.uuid4()),
+        "user_id": user_id,
+        "title": title,
+        "summary": parsed_data.get("summary") or "",
+        "section_settings": [dict(s) for s in PARSED_SECTION_SETTINGS],
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def section_rows(resume_id, parsed_data):
+    """
+    Maps parser output onto row dicts per section model, with dates and GPA
+    coerced. Entries missing a required column (an education entry with
+    neither institution nor degree, a skill without a name) are skipped.
+    """
+    rows = {model: [] for model in _SECTION_MODELS}
+
+    info = parsed_data.get("personal_info") or {}
+    if any(_text(v) for v in info.values()):
+        rows[PersonalInfo].append({
+            "id": str(uuid.uuid4()),
+            "resume_id": resume_id,
+            "full_name": _text(info.get("full_name")),
+            "email": _text(info.get("email")),
+            "phone": _text(info.get("phone")),
+            "location": _text(info.get("location")),
+            "linkedin": _text(info.get("linkedin")),
+            "github": _text(info.get("github")),
+            "portfolio": _text(info.get("portfolio"))
+        })
+
+    for edu in parsed_data.get("education") or []:
+        if not (_text(edu.get("institution")) or _text(edu.get("degree"))):
+            continue
+        rows[Education].append({
+            "id": str(uuid.uuid4()),
+            "resume_id": resume_id,
+            "institution": _text(edu.get("institution")),
+            "degree": _text(edu.get("degree")),
+            "field_of_study": _text(edu.get("field_of_study")),
+            "start_date": coerce_date(edu.get("start_date")),
+            "end_date": coerce_date(edu.get("end_date")),
+            "gpa": coerce_float(edu.get("gpa")),
+            "description": _text(edu.get("description"))
+        })
+
+    for exp in parsed_data.get("experience") or []:
+        if not (_text(exp.get("company")) or _text(exp.get("position"))):
+            continue
+        rows[Experience].append({
+            "id": str(uuid.uuid4()),
+            "resume_id": resume_id,
+            "company": _text(exp.get("company")),
+            "position": _text(exp.get("position")),
+            "location": _text(exp.get("location")),
+            "start_date": coerce_date(exp.get("start_date")),
+            "end_date": coerce_date(exp.get("end_date")),
+            "current": bool(exp.get("current")),
+            "description": _text(exp.get("description")),
+            "achievements": _list(exp.get("achievements"))
+        })
+
+    for skill in parsed_data.get("skills") or []:
+        # Gemini sometimes returns bare names instead of objects
+        skill = skill if isinstance(skill, dict) else {"name": skill}
+        if not _text(skill.get("name")):
+            continue
+        rows[Skill].append({
+            "id": str(uuid.uuid4()),
+            "resume_id": resume_id,
+            "name": _text(skill.get("name")),
+            "level": _text(skill.get("proficiency") or skill.get("level")),
+            "category": _text(skill.get("category"))
+        })
+
+    for project in parsed_data.get("projects") or []:
+        title = _text(project.get("name") or project.get("title"))
+        if not title:
+            continue
+        rows[Project].append({
+            "id": str(uuid.uuid4()),
+            "resume_id": resume_id,
+            "title": title,
+            "description": _text(project.get("description")),
+            "technologies": _list(project.get("technologies")),
+            "start_date": coerce_date(project.get("start_date")),
+            "end_date": coerce_date(project.get("end_date")),
+            "link": _text(project.get("link") or project.get("url"))
+        })
+
+    return rows
+
+
+def persist_parsed_resumes(records, session_factory=SessionLocal):
+    """
+    Inserts a Resume and all of its parsed sections for every record in a
+    single transaction with one executemany per table. records are dicts
+    with "data" (the parser output) and optionally "resume_id", "user_id" and
+    "title". Returns the resume IDs; on error the whole batch is rolled back
+    and the exception re-raised.
+    """
+    resumes = []
+    sections = {model: [] for model in _SECTION_MODELS}
+    for record in records:
+        row = resume_row(record["data"], record.get("resume_id"), record.get("user_id"), record.get("title") or "Parsed Resume")
+        resumes.append(row)
+        for model, rows in section_rows(row["id"], record["data"]).items():
+            sections[model].extend(rows)
+    if not resumes:
+        return []
+
+    db = session_factory()
+    try:
+        db.execute(insert(Resume), resumes)
+        for model in _SECTION_MODELS:
+            if sections[model]:
+                db.execute(insert(model), sections[model])
+        db.commit()
+        return [row["id"] for row in resumes]
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
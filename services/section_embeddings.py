@@ -0,0 +1,79 @@
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from database.db import SessionLocal
+from database.models import ResumeSectionEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+class SectionEmbeddingStore:
+    """
+    Persists one embedding per resume section together with the hash of the
+    text it was computed from, so only edited sections need re-encoding.
+    Database errors are logged and the store behaves as if it were empty.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def load(self, resume_id, model):
+        """Returns {section: (content_hash, vector)} for the resume."""
+        db = self.session_factory()
+        try:
+            rows = db.query(ResumeSectionEmbedding).filter(
+                ResumeSectionEmbedding.resume_id == resume_id,
+                ResumeSectionEmbedding.model == model
+            ).all()
+            return {
+                row.section: (row.content_hash, np.frombuffer(row.vector, dtype=np.float32))
+                for row in rows
+            }
+        except Exception as e:
+            logger.warning(f"Loading section embeddings for resume {resume_id} failed: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def save(self, resume_id, model, updates, removed=()):
+        """
+        updates maps section -> (content_hash, vector); sections in removed
+        (now empty) are deleted. Everything happens in one transaction.
+        """
+        if not updates and not removed:
+            return
+        db = self.session_factory()
+        try:
+            rows = {
+                row.section: row
+                for row in db.query(ResumeSectionEmbedding).filter(
+                    ResumeSectionEmbedding.resume_id == resume_id,
+                    ResumeSectionEmbedding.model == model
+                ).all()
+            }
+            for section, (content_hash, vector) in updates.items():
+                data = np.asarray(vector, dtype=np.float32).tobytes()
+                row = rows.get(section)
+                if row is None:
+                    db.add(ResumeSectionEmbedding(
+                        resume_id=resume_id,
+                        section=section,
+                        model=model,
+                        content_hash=content_hash,
+                        vector=data
+                    ))
+                else:
+                    row.content_hash = content_hash
+                    row.vector = data
+                    row.updated_at = datetime.utcnow()
+            for section in removed:
+                if section in rows:
+                    db.delete(rows[section])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Saving section embeddings for resume {resume_id} failed: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,62 @@
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+class SkillGap:
+    """
+    Result of matching a job's skills against a resume's skills.
+
+    Each entry in matches holds the job skill, the closest resume skill, the
+    fuzz.ratio score between them and whether that score clears the threshold.
+    """
+
+    def __init__(self, matches, threshold):
+        self.matches = matches
+        self.threshold = threshold
+
+    @property
+    def missing(self):
+        return [m["skill"] for m in self.matches if not m["matched"]]
+
+    @property
+    def matched(self):
+        return [m["skill"] for m in self.matches if m["matched"]]
+
+    def to_dict(self):
+        return {
+            "threshold": self.threshold,
+            "matches": self.matches,
+            "missing": self.missing
+        }
+
+
+def compute_skill_gap(resume_skills, job_skills, threshold=85):
+    """
+    Scores every job skill against every resume skill in one cdist call and
+    keeps the best resume skill per job skill.
+    """
+    job_skills = sorted(job_skills)
+    resume_skills = sorted(resume_skills)
+
+    if not job_skills:
+        return SkillGap([], threshold)
+    if not resume_skills:
+        return SkillGap(
+            [{"skill": s, "best_match": None, "score": 0.0, "matched": False} for s in job_skills],
+            threshold
+        )
+
+    scores = process.cdist(job_skills, resume_skills, scorer=fuzz.ratio, dtype=np.float64, workers=-1)
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(job_skills)), best]
+
+    matches = [
+        {
+            "skill": skill,
+            "best_match": resume_skills[b],
+            "score": round(float(score), 2),
+            "matched": bool(score >= threshold)
+        }
+        for skill, b, score in zip(job_skills, best, best_scores)
+    ]
+    return SkillGap(matches, threshold)
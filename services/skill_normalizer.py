@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+class SkillNormalizer:
+    """
+    Maps free-form skill tokens onto a controlled vocabulary.
+
+    Tokens that are already a known variant resolve through a dict lookup.
+    Everything else is scored against all variants in a single rapidfuzz
+    cdist call, and the outcome is remembered in an LRU so repeated tokens
+    never hit the fuzzy matcher twice. A token maps to the canonical name of
+    the first best-scoring variant when that score is strictly above the
+    threshold, otherwise it is returned lower-cased and stripped.
+    """
+
+    def __init__(self, vocabulary, threshold=85, cache_size=4096):
+        self.vocabulary = dict(vocabulary)
+        self.threshold = threshold
+        self.cache_size = cache_size
+
+        # Prebuilt choices array, in vocabulary order so ties resolve like a linear scan
+        self._choices = list(self.vocabulary)
+        self._canonical = [self.vocabulary[c] for c in self._choices]
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def standardize(self, skill):
+        return self.standardize_skills([skill])[0]
+
+    def standardize_skills(self, skills):
+        results = []
+        pending = {}
+        with self._lock:
+            for i, skill in enumerate(skills):
+                norm = skill.lower().strip()
+                canonical = self.vocabulary.get(norm)
+                if canonical is None:
+                    canonical = self._cache.get(norm)
+                    if canonical is not None:
+                        self._cache.move_to_end(norm)
+                    else:
+                        pending.setdefault(norm, []).append(i)
+                results.append(canonical)
+
+        if pending:
+            tokens = list(pending)
+            resolved = self._match(tokens)
+            with self._lock:
+                for token, canonical in zip(tokens, resolved):
+                    for i in pending[token]:
+                        results[i] = canonical
+                    self._cache[token] = canonical
+                    self._cache.move_to_end(token)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return results
+
+    def _match(self, tokens):
+        if not self._choices:
+            return list(tokens)
+        scores = process.cdist(tokens, self._choices, scorer=fuzz.ratio, dtype=np.float64, workers=-1)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(tokens)), best]
+        return [
+            self._canonical[b] if score > self.threshold else token
+            for token, b, score in zip(tokens, best, best_scores)
+        ]
@@ -0,0 +1,87 @@
+"""
+Checks services.markdown_text against fixtures of LLM-style outputs.
+
+Each fixture's "text" is the output of the old markdown + BeautifulSoup
+clean_markdown with the line breaks it put around every inline element
+removed, except before a bold "X Advice:" label, which starts a new line.
+Outputs are compared line by line after dropping trailing spaces and extra
+blank lines, so a lost or added line break fails the test.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import os
+import re
+import json
+import random
+import unittest
+
+from services.markdown_text import markdown_to_text, MarkdownTextStream
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "markdown_samples.json")
+
+# Same pattern ResumeOptimizer._extract_advice_from_response splits sections on
+ADVICE_SECTION = r"{}:\s*(.*?)(\n[A-Z][a-z]+ Advice:|$)"
+
+
+def normalize_newlines(text):
+    lines = [line.rstrip() for line in text.strip().split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def streamed(md_text, rng, max_chunk=12):
+    stream = MarkdownTextStream()
+    out = []
+    i = 0
+    while i < len(md_text):
+        n = rng.randint(1, max_chunk)
+        out.append(stream.feed(md_text[i:i + n]))
+        i += n
+    out.append(stream.close())
+    return "".join(out).strip()
+
+
+def advice_section(text, section):
+    match = re.search(ADVICE_SECTION.format(section), text, re.DOTALL)
+    return match.group(1).strip() if match else ""
+
+
+class MarkdownTextTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE_PATH) as f:
+            cls.samples = json.load(f)
+
+    def test_matches_fixtures(self):
+        for index, sample in enumerate(self.samples):
+            with self.subTest(index=index):
+                self.assertEqual(
+                    normalize_newlines(markdown_to_text(sample["markdown"])),
+                    normalize_newlines(sample["text"])
+                )
+
+    def test_stream_matches_one_shot(self):
+        rng = random.Random(0)
+        for index, sample in enumerate(self.samples):
+            expected = markdown_to_text(sample["markdown"])
+            for _ in range(25):
+                with self.subTest(index=index):
+                    self.assertEqual(streamed(sample["markdown"], rng), expected)
+
+    def test_bold_advice_label_starts_a_section(self):
+        text = markdown_to_text("Summary Advice: foo. **Skills Advice:** bar baz")
+        self.assertEqual(advice_section(text, "Summary Advice"), "foo.")
+        self.assertEqual(advice_section(text, "Skills Advice"), "bar baz")
+
+    def test_bold_label_at_line_start_stays_inline(self):
+        self.assertEqual(markdown_to_text("**Skills Advice:** bar baz"), "Skills Advice: bar baz")
+
+    def test_emphasis_across_lines(self):
+        self.assertEqual(markdown_to_text("*a\nb* and **c\nd**"), "a\nb and c\nd")
+
+    def test_unclosed_emphasis_is_kept(self):
+        self.assertEqual(markdown_to_text("para *never closed\nstill\n\nnext"), "para *never closed\nstill\n\nnext")
+
+
+if __name__ == "__main__":
+    unittest.main()
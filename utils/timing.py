@@ -0,0 +1,143 @@
+"""
+Per-request stage timings.
+
+`timed(name)` works as a context manager or a decorator. Inside a request it
+adds its duration to the request's collector, which the blueprint turns into
+a Server-Timing header and folds into the process-wide aggregates served by
+/api/metrics/timings. Outside a request it only costs two clock reads.
+
+The collector lives in a ContextVar, so work handed to a thread pool has to be
+submitted with `submit_with_context` to be counted against the request.
+"""
+import time
+import threading
+import contextvars
+from collections import deque
+from functools import wraps
+
+_collector = contextvars.ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}  # name -> [total_ms, count]
+
+    def add(self, name, ms):
+        with self._lock:
+            entry = self.stages.setdefault(name, [0.0, 0])
+            entry[0] += ms
+            entry[1] += 1
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def header(self):
+        # Repeated stages are summed; parallel pool work can add up to more than "total"
+        with self._lock:
+            parts = [f"{name};dur={ms:.1f}" + (f';desc="{count}x"' if count > 1 else "")
+                     for name, (ms, count) in self.stages.items()]
+        parts.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(parts)
+
+
+class _Timer:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        collector = _collector.get()
+        if collector is not None:
+            collector.add(self.name, (time.perf_counter() - self._start) * 1000)
+        return False
+
+    def __call__(self, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(self.name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def timed(name):
+    """`with timed("db"): ...` or `@timed("embedding")`."""
+    return _Timer(name)
+
+
+def start_request():
+    """Starts collecting for the current request; returns the token for end_request()."""
+    return _collector.set(RequestTimings())
+
+
+def current_request():
+    return _collector.get()
+
+
+def end_request(token):
+    try:
+        _collector.reset(token)
+    except ValueError:
+        # Token from another context (e.g. a streamed response finishing elsewhere)
+        _collector.set(None)
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    # Runs fn in a copy of the caller's context so its timings land on the same request
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (pct in 0..100), None if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class TimingAggregator:
+    """Keeps the last `window` durations per endpoint and stage for percentile reporting."""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._requests = {}
+
+    def record(self, endpoint, timings):
+        total = timings.total_ms()
+        with timings._lock:
+            stages = {name: ms for name, (ms, _) in timings.stages.items()}
+        stages["total"] = total
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            by_stage = self._samples.setdefault(endpoint, {})
+            for name, ms in stages.items():
+                by_stage.setdefault(name, deque(maxlen=self.window)).append(ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": self._requests[endpoint],
+                    "stages": {
+                        name: {
+                            "count": len(samples),
+                            "mean_ms": round(sum(samples) / len(samples), 2),
+                            "p50_ms": round(percentile(samples, 50), 2),
+                            "p95_ms": round(percentile(samples, 95), 2),
+                            "max_ms": round(max(samples), 2)
+                        }
+                        for name, samples in by_stage.items()
+                    }
+                }
+                for endpoint, by_stage in self._samples.items()
+            }
+
+
+aggregator = TimingAggregator()